@@ -1,5 +1,5 @@
 import numpy as np
-import time,os
+import io,time,os
 
 
 script_dir=  os.path.abspath(os.path.dirname(__file__))
@@ -9,23 +9,37 @@ fov_v_deg=['-5.6','-2.8','0','2.8','5.6']
 direction=['v','h']
 spatial_frequency_apd=['16.9cpd','8.45cpd','5.63cpd']
 spatial_period_lea_px=['2pixel','4pixel','6pixel']
-def split_str(*args):
-    output=""
-    for item in args:
-        output+=str(item)+","
-    output+="\n"
-    return output
+csv_buffer_size=1<<20
+data_collection_name="CTF_summarize.csv"
+ctf_ui_path=os.path.abspath(os.path.join(script_dir,"..","..","CTF.csv"))
+ctf_header="fixture_name,fixture_software_version,operator_id,timestamd,colors,asset_name,fov_v_deg,fov_h_deg,grill orientation,spatial_frequency_apd,spatial_period_lea_px,ctf_percent,michelson_percentile_min,michelson_percentile_max\n"
+ctf_freq_index=1
+ctf_spatial_frequency_apd=spatial_frequency_apd[ctf_freq_index]
+ctf_spatial_period_lea_px=spatial_period_lea_px[ctf_freq_index]
+asset_names=[[[f"capture_{freq_index+1}_{d}_{c}.png" for freq_index in range(3)] for d in direction] for c in colors]
+ctf_color_index,ctf_fov_v_index,ctf_fov_h_index,ctf_direction_index=np.indices((3,5,5,2)).reshape(4,-1)
+ctf_offsets=np.ravel_multi_index((ctf_color_index,ctf_fov_v_index,ctf_fov_h_index,ctf_direction_index,np.full(ctf_color_index.size,ctf_freq_index)),(3,5,5,2,3))
+ctf_label_columns=[np.array(colors)[ctf_color_index],
+                   np.array(asset_names)[ctf_color_index,ctf_direction_index,ctf_freq_index],
+                   np.array(fov_v_deg)[ctf_fov_v_index],
+                   np.array(fov_h_deg)[ctf_fov_h_index],
+                   np.array(direction)[ctf_direction_index],
+                   np.full(ctf_color_index.size,ctf_spatial_frequency_apd),
+                   np.full(ctf_color_index.size,ctf_spatial_period_lea_px)]
+ctf_limit_columns=[np.full(ctf_color_index.size,"21"),
+                   np.full(ctf_color_index.size,"79")]
+def ctf_columns(ctf_result):
+    values=np.asarray(ctf_result).reshape(-1)[ctf_offsets]
+    return ctf_label_columns+[values.astype(str)]+ctf_limit_columns
+def write_rows(f,*fixed,columns):
+    rows=len(columns[0])
+    table=np.column_stack([np.full(rows,str(item)) for item in fixed]+columns)
+    np.savetxt(f,table,fmt=",".join(["%s"]*table.shape[1])+",",newline="\n")
 class DUT_data:
     
     DUT_codename="A72"
     serial_number=""
     dataset_name="CTF"
-    start_time=time.strftime("%Y-%m-%d %H-%M-%S", time.localtime())
-    ctf_result_blue=[]
-    ctf_result_green=[]
-    ctf_result_red=[]
-    
-    ctf_result=np.zeros((3,5,5,2,3),dtype=np.float32)
     
     fixture_name="Ver.1"
     fixture_software_version="Ver.1"
@@ -43,50 +57,40 @@ class DUT_data:
         self.serial_number=SN
         self.operator_id=operator
         self.index=index_in
+        now=time.localtime()
+        self.start_time=time.strftime("%Y-%m-%d %H-%M-%S", now)
+        self.ctf_result_blue=[]
+        self.ctf_result_green=[]
+        self.ctf_result_red=[]
+        self.ctf_result=np.zeros((3,5,5,2,3),dtype=np.float32)
 
     def Set_CTF_result(self,ctf_result):
             self.ctf_result=ctf_result
-            self.timestamd=str(time.time())
+            self.timestamd=f"{time.time():.6f}"
 
     
+    def _rows(self,include_sn):
+        fixed=[self.fixture_name,self.fixture_software_version,self.operator_id,self.timestamd]
+        if include_sn:
+            fixed.insert(0,f"{self.serial_number}_{self.operator_id}_{self.index}")
+        buf=io.StringIO()
+        write_rows(buf,*fixed,columns=ctf_columns(self.ctf_result))
+        return buf.getvalue()
     def Save_CSV_file(self,Dir):
-        file_name="{}_{}_{}_{}.csv".format(self.DUT_codename,self.serial_number,self.dataset_name,self.start_time)
+        file_name=f"{self.DUT_codename}_{self.serial_number}_{self.dataset_name}_{self.start_time}.csv"
         print(file_name)
-        data_collection_name="CTF_summarize.csv"
-        if os.path.exists(os.path.join(Dir,"..",data_collection_name)):
-            pass
-        else:
-            with open(os.path.join(Dir,"..",data_collection_name),'w') as f:
-                f.write("SN,fixture_name,fixture_software_version,operator_id,timestamd,colors,asset_name,fov_v_deg,fov_h_deg,grill orientation,spatial_frequency_apd,spatial_period_lea_px,ctf_percent,michelson_percentile_min,michelson_percentile_max\n")
-        with open(os.path.join(Dir,"..",data_collection_name),'a') as f:
-            for color_index in range(3):
-                for fov_v_index in range(5):
-                    for fov_h_index in range(5):
-                        for direction_index in range(2):
-                            for freq_index in range(1,2):
-                                asset_name="capture_{}_{}_{}.png".format(freq_index+1,direction[direction_index],colors[color_index])
-                                f.write(split_str(str(self.serial_number)+"_{}_{}".format(self.operator_id,self.index),self.fixture_name,self.fixture_software_version,self.operator_id,self.timestamd,colors[color_index],asset_name,fov_v_deg[fov_v_index],fov_h_deg[fov_h_index],direction[direction_index],spatial_frequency_apd[freq_index],spatial_period_lea_px[freq_index],self.ctf_result[color_index][fov_v_index][fov_h_index][direction_index][freq_index],"21","79"))
-        with open(os.path.join(Dir,file_name),'w') as f:
-            f.write("fixture_name,fixture_software_version,operator_id,timestamd,colors,asset_name,fov_v_deg,fov_h_deg,grill orientation,spatial_frequency_apd,spatial_period_lea_px,ctf_percent,michelson_percentile_min,michelson_percentile_max\n")
-            for color_index in range(3):
-                for fov_v_index in range(5):
-                    for fov_h_index in range(5):
-                        for direction_index in range(2):
-                            for freq_index in range(1,2):
-                                asset_name="capture_{}_{}_{}.png".format(freq_index+1,direction[direction_index],colors[color_index])
-                                f.write(split_str(self.fixture_name,self.fixture_software_version,self.operator_id,self.timestamd,colors[color_index],asset_name,fov_v_deg[fov_v_index],fov_h_deg[fov_h_index],direction[direction_index],spatial_frequency_apd[freq_index],spatial_period_lea_px[freq_index],self.ctf_result[color_index][fov_v_index][fov_h_index][direction_index][freq_index],"21","79"))
+        os.makedirs(os.path.join(Dir,".."),exist_ok=True)
+        os.makedirs(Dir,exist_ok=True)
+        with open(os.path.join(Dir,"..",data_collection_name),'a',buffering=csv_buffer_size) as f:
+            if f.tell()==0:
+                f.write("SN,"+ctf_header)
+            f.write(self._rows(True))
+        with open(os.path.join(Dir,file_name),'w',buffering=csv_buffer_size) as f:
+            f.write(ctf_header+self._rows(False))
     def Save_CSV_file_UI(self):
-        file_name="CTF.csv"
-        print(file_name)
-        with open(os.path.join(script_dir,"..","..",file_name),'w') as f:
-            f.write("fixture_name,fixture_software_version,operator_id,timestamd,colors,asset_name,fov_v_deg,fov_h_deg,grill orientation,spatial_frequency_apd,spatial_period_lea_px,ctf_percent,michelson_percentile_min,michelson_percentile_max\n")
-            for color_index in range(3):
-                for fov_v_index in range(5):
-                    for fov_h_index in range(5):
-                        for direction_index in range(2):
-                            for freq_index in range(1,2):
-                                asset_name="capture_{}_{}_{}.png".format(freq_index+1,direction[direction_index],colors[color_index])
-                                f.write(split_str(self.fixture_name,self.fixture_software_version,self.operator_id,self.timestamd,colors[color_index],asset_name,fov_v_deg[fov_v_index],fov_h_deg[fov_h_index],direction[direction_index],spatial_frequency_apd[freq_index],spatial_period_lea_px[freq_index],self.ctf_result[color_index][fov_v_index][fov_h_index][direction_index][freq_index],"21","79"))
+        print(os.path.basename(ctf_ui_path))
+        with open(ctf_ui_path,'w',buffering=csv_buffer_size) as f:
+            f.write(ctf_header+self._rows(False))
 
         
     
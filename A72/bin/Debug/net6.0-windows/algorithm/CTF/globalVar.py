@@ -1,5 +1,5 @@
 import cv2
-import os,stat,sys,time,traceback
+import os,stat,subprocess,sys,time,traceback
 import numpy as np
 import math
 sides=['v','h']
@@ -12,6 +12,8 @@ pattern_folder=os.path.join(script_dir,"pattern")
 capture_folder=os.path.join(script_dir,"capture")
 process_folder=os.path.join(script_dir,"process")
 UI_file_name="UI_status.txt"
+UI_status_path=os.path.abspath(os.path.join(script_dir,"..","..",UI_file_name))
+UI_image_path=os.path.abspath(os.path.join(script_dir,"..","..","UI.png"))
 def check_folder(folder_path):
     if os.path.exists(folder_path)==0:
         os.mkdir(folder_path)
@@ -19,11 +21,7 @@ def check_folder(folder_path):
         print("Creat {} Folder".format(os.path.basename(folder_path)))
 
 def cmdcommand(*input):
-    with open('command.bat', 'w') as f:
-        for i in range(0,len(input)):
-            f.write(input[i]+"\n")
-    
-    os.system("command.bat")
+    subprocess.run(" & ".join(input), shell=True)
 def show_pattern(img,Dir):
     cv2.imwrite(os.path.join(Dir,"ready.png"),img)
     
@@ -41,94 +39,100 @@ def close():
                 r"call conda activate p29_mfg",
                 r"calibration_client -d rb3 --power off --display off"
                )
-def show_image(img):
-    cv2.namedWindow('Show Mason Image', cv2.WINDOW_NORMAL)
-    cv2.imshow('Show Mason Image', img)
-    cv2.waitKey(0)
-    cv2.destroyAllWindows()
+show_window_name='Show Mason Image'
+show_window_created=False
+def show_image(img,delay=1):
+    # the window is created once and reused; call close_image() when done
+    global show_window_created
+    if not show_window_created:
+        cv2.namedWindow(show_window_name, cv2.WINDOW_NORMAL)
+        show_window_created=True
+    cv2.imshow(show_window_name, img)
+    cv2.waitKey(delay)
+def close_image():
+    global show_window_created
+    if show_window_created:
+        cv2.destroyWindow(show_window_name)
+        show_window_created=False
 
-def is_file_write_complete():
-    result_path = os.path.join(script_dir, "..", "..", UI_file_name)
-    # 檢查檔案的修改時間是否超過某個閾值，表示寫入已完成
-    threshold_seconds = 1  # 設定閾值，單位為秒
-    current_time = time.time()
-    modified_time = os.path.getmtime(result_path)
-    elapsed_time = current_time - modified_time
-    return elapsed_time >= threshold_seconds
-def show2UI(img, img_message):
-    cv2.imwrite(os.path.join(script_dir, "..", "..", "UI.png"), img)
-    result_path = os.path.join(script_dir, "..", "..", UI_file_name)
-    txt_context = ""
-    with open(result_path, 'r') as f:
-        line = f.readline()
-        while line != "" and line is not None:
-            if "image imfo." in line:
-                txt_context += "image imfo.:{}\n".format(img_message)
-            else:
-                txt_context += line
-            line = f.readline()
-    while not is_file_write_complete():
-        time.sleep(0.1)  # 等待0.1秒
-    with open(result_path, 'w') as f:
+def _publish(tmp_path, dst_path):
+    # rename tmp_path over dst_path. The UI (data.cs) opens the status file with FileShare.ReadWrite but
+    # not FileShare.Delete, and Windows refuses a rename over a file held that way, so retry for a while
+    # and then fall back to writing dst_path in place, which that sharing mode allows
+    for _ in range(50):
+        try:
+            os.replace(tmp_path, dst_path)
+            return
+        except PermissionError:
+            time.sleep(0.02)
+    with open(tmp_path, 'rb') as src, open(dst_path, 'wb') as dst:
+        dst.write(src.read())
+    os.remove(tmp_path)
+def write_UI_status(txt_context):
+    # write a temp file and rename it over the status file so the UI never sees a partial write
+    tmp_path = UI_status_path + ".tmp"
+    with open(tmp_path, 'w') as f:
         f.write(txt_context)
-    while not is_file_write_complete():
-        time.sleep(0.1)
+        f.flush()
+        os.fsync(f.fileno())
+    _publish(tmp_path, UI_status_path)
+def show2UI(img, img_message):
+    # fast PNG level; the UI polls for UI.png, so publish it with an atomic rename
+    _, png = cv2.imencode(".png", img, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+    with open(UI_image_path + ".tmp", 'wb') as f:
+        f.write(png.tobytes())
+    _publish(UI_image_path + ".tmp", UI_image_path)
+    with open(UI_status_path, 'r') as f:
+        lines = f.read().splitlines()
+    for i, line in enumerate(lines):
+        if "image imfo." in line:
+            lines[i] = "image imfo.:{}".format(img_message)
+    write_UI_status("".join(line + "\n" for line in lines))
     print("show UI image")
 
 
 def init_UI():
     # mode 0:write 1:modify 2:delete 3:clear TXT file
 
-    result_path = os.path.join(script_dir, "..", "..", UI_file_name)
-    with open(result_path, 'w') as f:
-        f.write("image imfo.:{}\n".format("initial UI"))
-        f.write("{},{},{}\n".format("Brightness", "initial", "waiting proccess start"))
-        f.write("{},{},{}\n".format("CTF", "initial", "waiting proccess start"))
-        f.write("{},{},{}\n".format("Contrast", "initial", "waiting proccess start"))
-        f.write("{},{},{}\n".format("Uniformity", "initial", "waiting proccess start"))
-    while not is_file_write_complete():
-        time.sleep(0.1)  # 等待0.1秒
+    write_UI_status("image imfo.:{}\n".format("initial UI") +
+                    "{},{},{}\n".format("Brightness", "initial", "waiting proccess start") +
+                    "{},{},{}\n".format("CTF", "initial", "waiting proccess start") +
+                    "{},{},{}\n".format("Contrast", "initial", "waiting proccess start") +
+                    "{},{},{}\n".format("Uniformity", "initial", "waiting proccess start"))
     print("Status update: initial")
     sys.stdout.flush()
 
 
+def modify_UI(updates):
+    # updates: {station: (status, errorcode)}, applied in one read + one write
+    with open(UI_status_path, 'r') as f:
+        lines = f.read().splitlines()
+    for i, line in enumerate(lines):
+        for station, (status, errorcode) in updates.items():
+            if station in line:
+                lines[i] = "{},{},{}".format(station, status, errorcode)
+                break
+    write_UI_status("".join(line + "\n" for line in lines))
+
+
 def Update_UI(mode, station, status, errorcode):
     # mode 0:write 1:modify 2:delete 3:clear TXT file
 
-    result_path = os.path.join(script_dir, "..", "..", UI_file_name)
+    result_path = UI_status_path
     try:
 
         if mode == 0:
             with open(result_path, 'a') as f:
                 f.write("{},{},{}\n".format(station, status, errorcode))
+                f.flush()
+                os.fsync(f.fileno())
         elif mode == 1:
-            txt_context = ""
-            with open(result_path, 'r') as f:
-                line = f.readline()
-                while line != "" and line is not None:
-                    if station in line:
-                        txt_context += "{},{},{}\n".format(station, status, errorcode)
-                    else:
-                        txt_context += line
-                    line = f.readline()
-            time.sleep(0.1)
-            while not is_file_write_complete():
-                time.sleep(0.1)  # 等待0.1秒
-            with open(result_path, 'w') as f:
-                f.write(txt_context)
+            modify_UI({station: (status, errorcode)})
 
         elif mode == 2:
-            txt_context = ""
             with open(result_path, 'r') as f:
-                line = f.readline()
-                while line != "" and line is not None:
-                    if station in line:
-                        pass
-                    else:
-                        txt_context += line
-                    line = f.readline()
-            with open(result_path, 'w') as f:
-                f.write(txt_context)
+                lines = [line for line in f.read().splitlines() if station not in line]
+            write_UI_status("".join(line + "\n" for line in lines))
         elif mode == 3:
             init_UI()
         else:
@@ -144,8 +148,6 @@ def Update_UI(mode, station, status, errorcode):
         funcName = lastCallStack[2]  # 取得發生的函數名稱
         errMsg = "File \"{}\", line {}, in {}: [{}] {}".format(fileName, lineNum, funcName, error_class, detail)
         print("A72 ERROR:{}".format(errMsg))
-    while not is_file_write_complete():
-        time.sleep(0.1)  # 等待0.1秒
     print("Status update:{} {} {}".format(station, status, errorcode))
     sys.stdout.flush()
     
@@ -3,10 +3,15 @@
 Implements a Python wrapper for the USB-UART protocol to the JBD 4020 control
 board.  UART data protocol outlined in JBD Comm_protocol_4020_V2.2.4 document
 """
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+import csv
 from enum import Enum
-import inspect
+import functools
 import logging
 import os
+import struct
+import sys
 import time
 import cv2
 import numpy as np
@@ -14,10 +19,24 @@ import serial
 import serial.tools.list_ports
 from dataclasses import dataclass, fields
 from typing import Union
+# the gamma/register csv files ship next to this module
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
 CMD_SUFFIX = b"\x4a\x42\x44"  # b"JBD" at the end of each sent msg
+# zero padding between a command of len n and CMD_SUFFIX, indexed by n
+_PADDING = tuple(b"\x00" * (12 - n - len(CMD_SUFFIX)) for n in range(10))
 # TODO: does this take a long with a panel connected?
 RESET_DELAY = 15  # after a reset the board takes a while to come up
+RESET_PROBE_INTERVAL = 0.25  # sec between checks if the board is back up
 PORT_DESCRIPTION_FILTER = "Silicon Labs CP210x USB to UART Bridge"
+PORT_VID_PID = (0x10C4, 0xEA60)  # CP210x USB to UART Bridge
+# driver rx/tx queue size, large enough for a whole 640x480 RGB image
+UART_BUFFER_SIZE = 1024 * 1024
+# register writes per pipelined UART transaction for long lists (gamma LUTs)
+REGISTER_WRITE_BATCH = 64
+# same for register reads, see Jbd4020CtrlBrd._read_registers_flow
+REGISTER_READ_BATCH = 64
+# RLE encodes the R, G, B planes side by side, numpy releases the GIL
+_RLE_POOL = ThreadPoolExecutor(max_workers=3)
 # Enumerate the known Control Board FW versions
 CB_FW_VERSIONS = {
   "V1.12.06": 1,
@@ -30,11 +49,37 @@ CB_FW_VERSIONS = {
   "V1.14.G4": 8,
   "V1.14.G7": 9
 }
+# same, keyed by the raw version bytes the control board sends back
+_CB_FW_VERSION_MAP = {k.encode(): v for k, v in CB_FW_VERSIONS.items()}
+_CB_FW_VERSIONS_INV = {v: k for k, v in CB_FW_VERSIONS.items()}
+_LATEST_CB_VER_INT = max(CB_FW_VERSIONS.values())
+_LATEST_CB_VER_STR = _CB_FW_VERSIONS_INV[_LATEST_CB_VER_INT]
 
-def find_port():
+_PORT_CACHE = {}
+
+def find_port(refresh=False):
+  """Returns the control board COM port.
+
+  Enumerating the ports is slow on Windows, so the result is cached.  Ports
+  are matched on the CP210x VID:PID, or on PORT_DESCRIPTION_FILTER for
+  drivers that do not report it.
+
+  Args:
+    refresh: bool, True = enumerate the ports again instead of using the cache
+
+  Returns:
+    str, the device name of the port, i.e. "COM3"
+
+  Raises:
+    RuntimeError: if no matching port is found
+  """
+  if not refresh and PORT_VID_PID in _PORT_CACHE:
+    return _PORT_CACHE[PORT_VID_PID]
   ports = serial.tools.list_ports.comports()
   for p in ports:
-    if PORT_DESCRIPTION_FILTER in p.description:
+    if ((p.vid, p.pid) == PORT_VID_PID or
+        PORT_DESCRIPTION_FILTER in (p.description or "")):
+      _PORT_CACHE[PORT_VID_PID] = p.device
       return p.device
   else:
     raise RuntimeError("Unable to locate matching device.")
@@ -44,7 +89,7 @@ class GammaPath(Enum):
 
      Used with pass_thru method.
   """
-  current_file_directory = os.path.dirname(os.path.abspath(__file__))
+  current_file_directory = _MODULE_DIR
   gs_1_0_lreg_1_0 = os.path.join(current_file_directory,
                                  "gamma1.0_2.csv")
   gs_2_2_lreg_2_2 = os.path.join(current_file_directory,
@@ -114,6 +159,36 @@ class JbdPaneResolutionIdx(Enum):
   res_640x480 = b"\x00"
   res_660x504 = b"\x01"
 
+# plain bytes copies of enum values used on every call, skips the Enum lookup
+_CMD_SYSTEM_RESET = JbdControlMsg.system_reset.value
+_CMD_CONTROL_PANEL_RESET = JbdControlMsg.control_panel_reset.value
+_CMD_SET_HDMI = JbdControlMsg.set_hdmi.value
+_CMD_DISPLAY_ENABLE = JbdControlMsg.display_enable.value
+_CMD_READ_TEMP_SENSOR = JbdControlMsg.read_temp_sensor.value
+_CMD_READ_DIE_ID = JbdControlMsg.read_die_id.value
+_CMD_WRITE_LREG = JbdControlMsg.write_lreg.value
+_CMD_WRITE_CREG = JbdControlMsg.write_creg.value
+_CMD_SET_H_MIRROR = JbdControlMsg.set_h_mirror.value
+_CMD_SET_V_MIRROR = JbdControlMsg.set_v_mirror.value
+_CMD_RANDOM_SCAN = JbdControlMsg.random_scan_control.value
+_CMD_DITHER_ENABLE = JbdControlMsg.dither_enable.value
+_CMD_READ_REGISTER = JbdControlMsg.read_register.value
+_CMD_DRAW_RECTANGLE = JbdControlMsg.draw_rectangle.value
+_CMD_SET_DISPLAY_RESOLUTION = JbdControlMsg.set_display_resolution.value
+_CMD_GAMMA_ON_OFF = JbdControlMsg.gamma_on_off.value
+_CMD_DISPLAY_MONO_IMAGE = JbdControlMsg.display_mono_image.value
+_CMD_DISPLAY_COLOR_IMAGE = JbdControlMsg.display_color_image.value
+_CMD_WRITE_COLOR_IMAGE_RLE = JbdControlMsg.write_color_image_rle.value
+# commands answered with a data_flow behind the 12 byte header
+_FLOW_RESPONSE_CMDS = frozenset((_CMD_READ_REGISTER, _CMD_READ_TEMP_SENSOR,
+                                 _CMD_READ_DIE_ID,
+                                 JbdControlMsg.read_efuse.value))
+# commands whose response carries data, never queued by batch()
+_READ_CMDS = _FLOW_RESPONSE_CMDS | {JbdControlMsg.get_firmware.value}
+_IMAGE_ROWS_COLS = bytes(4)  # rows, cols (2 bytes each), not used per the API
+_RLE_HEADER_TAIL = b"\x00\x00\x00" + CMD_SUFFIX  # after the RLE flow_len
+_PANEL_VAL = {panel: panel.value for panel in JbdPanel}
+
 # @dataclass
 # class JbdI2cAddr:
 #   """Structure organizing a value associated with a I2C Address"""
@@ -143,6 +218,65 @@ class JbdReadResponse:
   b_b2b_g_0x5A: str = None
   b_b2b_b_0x5B: str = None
 
+# JbdReadResponse fields holding each color, in the order get_register looks
+# at them (green B2B first)
+_READ_RESPONSE_FIELDS = {
+  JbdPanel.red: ("g_b2b_r_0x59", "r_b2b_r_0x59", "b_b2b_r_0x59"),
+  JbdPanel.green: ("g_b2b_g_0x5A", "r_b2b_g_0x5A", "b_b2b_g_0x5A"),
+  JbdPanel.blue: ("g_b2b_b_0x5B", "r_b2b_b_0x5B", "b_b2b_b_0x5B"),
+}
+# JbdReadResponse field names indexed by the tag byte of a read record
+_READ_RESPONSE_NAMES = tuple(f.name for f in fields(JbdReadResponse))
+
+def _panel_value(reads, panel):
+  """Picks the data bytes of one color out of a JbdReadResponse, or None."""
+  for name in _READ_RESPONSE_FIELDS[panel]:
+    value = getattr(reads, name)
+    if value is not None:
+      return value
+  return None
+
+def _hex(data):
+  """Formats register bytes as "0x..." (None stays None)."""
+  return None if data is None else "0x" + bytes(data).hex()
+
+# (SRAM 0x03030004 value, VO 0x0300015C mirror bits) by ud_mirror << 1 | lr
+_MIRROR_BITS = ((0, 0), (1, 0x40000000), (2, 0x80000000), (3, 0xC0000000))
+
+# (SRAM 0x03030008 value, VO 0x0300015C offset bits) by [y_offset][x_offset],
+# offsets are 0..24, the enable bit is set if either is non-zero
+_OFFSETS = tuple(
+  tuple((y << 12 | x << 4 | int(x > 0 or y > 0),
+         int(x > 0 or y > 0) << 29 | y << 16 | x) for x in range(25))
+  for y in range(25))
+
+def _unpack_mirror_offset(sram_mirror_flip, sram_offset, vo):
+  """Extracts the mirror and offset fields from the three config registers.
+
+  Only masks and shifts are used, so this works on plain ints as well as
+  element-wise on np.uint32 arrays holding many register captures at once.
+
+  Args:
+    sram_mirror_flip: value(s) of SRAM config register 0x03030004
+    sram_offset: value(s) of SRAM config register 0x03030008
+    vo: value(s) of register 0x0300015C
+
+  Returns:
+    Tuple of (sram_lr_mirror, sram_ud_mirror, sram_offset_en, sram_offset_x,
+    sram_offset_y, vo_ud_mirror, vo_lr_mirror, vo_offset_en, vo_offset_y,
+    vo_offset_x).  Enable / mirror fields are 0 or 1.
+  """
+  return (0x1 & sram_mirror_flip,
+          (0x2 & sram_mirror_flip) >> 1,
+          0x1 & sram_offset,
+          (0x1F0 & sram_offset) >> 4,
+          (0x1F000 & sram_offset) >> 12,
+          (0x80000000 & vo) >> 31,
+          (0x40000000 & vo) >> 30,
+          (0x20000000 & vo) >> 29,
+          (0x0FFF0000 & vo) >> 16,
+          0x00000FFF & vo)
+
 @dataclass
 class JbdMirrorOffsetConfig:
   """Structure organizing Mirror (flip) and offset config for SRAM and VO."""
@@ -178,18 +312,17 @@ class JbdMirrorOffsetConfig:
     if (self.sram_mirror_flip is not None and
         self.sram_offset is not None and
         self.vo is not None):
-      self.sram_lr_mirror = bool(0x1 & self.sram_mirror_flip)
-      self.sram_ud_mirror = bool((0x2 & self.sram_mirror_flip) >> 1)
-
-      self.sram_offset_en = bool(0x1 & self.sram_offset)
-      self.sram_offset_x = (0x1F0 & self.sram_offset) >> 4
-      self.sram_offset_y = (0x1F000 & self.sram_offset) >> 12
-
-      self.vo_ud_mirror = bool((0x80000000 & self.vo) >> 31)
-      self.vo_lr_mirror = bool((0x40000000 & self.vo) >> 30)
-      self.vo_offset_en = bool((0x20000000 & self.vo) >> 29)
-      self.vo_offset_y = (0x0FFF0000 & self.vo) >> 16
-      self.vo_offset_x = 0x00000FFF & self.vo
+      (sram_lr_mirror, sram_ud_mirror, sram_offset_en,
+       self.sram_offset_x, self.sram_offset_y,
+       vo_ud_mirror, vo_lr_mirror, vo_offset_en,
+       self.vo_offset_y, self.vo_offset_x) = _unpack_mirror_offset(
+           self.sram_mirror_flip, self.sram_offset, self.vo)
+      self.sram_lr_mirror = bool(sram_lr_mirror)
+      self.sram_ud_mirror = bool(sram_ud_mirror)
+      self.sram_offset_en = bool(sram_offset_en)
+      self.vo_ud_mirror = bool(vo_ud_mirror)
+      self.vo_lr_mirror = bool(vo_lr_mirror)
+      self.vo_offset_en = bool(vo_offset_en)
       if self.sram_offset_en != self.vo_offset_en:
         self.logger.warning("SRAM offset enable = %s & VO offset enable = %s "
                             "do not match",
@@ -230,9 +363,312 @@ class MipiRefreshConfig(Enum):
 # convert the resolutions above to a tuple
 _PANEL_RESOLUTIONS = {JbdPaneResolutionIdx.res_640x480: (640, 480),
                       JbdPaneResolutionIdx.res_660x504: (660, 504)}
+# Pass thru panel init sequence (JBD Init Code 1.6.4, modified to assume no
+# flash memory is present), one row per register write:
+#   (address, data, panel, always, delay_ms)
+# panel 0 writes to the panel(s) being initialized.  Otherwise the row goes to
+# that color only, and only if it is being initialized unless always is set.
+# delay_ms is a wait after the row.
+_PASS_THRU_INIT_STEPS = np.array([
+  ## SRAM Initialization
+  # Switch off PWM CLK
+  (0x03030300, 0x00000010, 0, 0, 0),
+  # Panel Initialization
+  (0x03030144, 0x40000000, 0, 0, 0),
+  # MUTE set max resolution
+  (0x030001C8, 0x0029F1FF, 0, 0, 0),
+  # Background gray value set 0
+  (0x030001B8, 0x00000000, 0, 0, 0),
+  # MUTE enable
+  (0x030001C4, 0x00000001, 0, 0, 0),
+  # Display background color mode
+  (0x03000180, 0x2003D01B, 0, 0, 0),
+  # Display port enable
+  (0x03030100, 0x80000011, 0, 0, 0),
+  (0x03040008, 0x00000001, 0, 0, 20),  # wait for 20ms
+  # XDP reset
+  (0x0100003C, 0x20021F3F, 0, 0, 0),
+  # XDP reset release
+  (0x0100003C, 0x2002003F, 0, 0, 0),
+  # Clear MIPI interruption
+  (0x02006720, 0xFFFFFFFF, 0, 0, 0),
+  (0x02006724, 0xFFFFFFFF, 0, 0, 0),
+  (0x02006728, 0xFFFFFFFF, 0, 0, 0),
+  # Error count clear
+  (0x02006740, 0xFFFFFFFF, 0, 0, 1000),  # wait for 1s
+  # MIPI PCS
+  (0x02007228, 0x000C33FF, 0, 0, 0),
+  (0x020072C0, 0x00000001, 0, 0, 0),
+  (0x020072C0, 0x00000000, 0, 0, 0),
+  # MIPI CTRL
+  (0x0200600C, 0x00000001, 0, 0, 0),
+  (0x020060A8, 0x00002263, 0, 0, 0),
+  (0x02006014, 0x00000200, 0, 0, 0),
+  (0x02006200, 0x00000001, 0, 0, 0),
+  # Set MIPI image data mode
+  # 0x00000000 video mode (JBD control board uses video mode)
+  # 0000000001 command mode
+  (0x02006230, 0x00000000, 0, 0, 0),
+  (0x02006700, 0x001FFFFF, 0, 0, 0),
+  (0x02006704, 0x003FFFFF, 0, 0, 0),
+  (0x02006708, 0x00181BFF, 0, 0, 0),
+  (0x02006160, 0x0001FFFF, 0, 0, 0),
+  # Enable MIPI Detection function
+  (0x02006788, 0x0200001F, 0, 0, 0),
+  (0x02006000, 0x00020002, 0, 0, 0),
+  (0x01000090, 0x00600F86, 0, 0, 0),
+  (0x02006000, 0x00000002, 0, 0, 0),
+  # XDP: resolution, refresh , pixel current, algorithm setting
+  # Can't set these as set_register blasts to all panels,
+  # but need to set R,G,B to different values
+  # MIPI signal select, b9: 0-video mode; 1-cmd mode; b14~15: 0-R, 1-G, 2-B
+  (0x03040000, 0x00000103, 1, 0, 0),  #R
+  (0x03040000, 0x00004103, 2, 0, 0),  #G
+  (0x03040000, 0x00008103, 4, 0, 0),  #B
+  # set 640x480 (0x01DF = 639, 0x027F = 439)
+  (0x030000D0, 0x01DF027F, 0, 0, 0),
+  (0x03000080, 0x00000100, 0, 0, 0),
+  (0x03030300, 0x00000000, 0, 0, 0),
+  (0x03041004, 0x00000001, 0, 0, 0),
+  # 54M(60Hz)
+  (0x0100003C, 0x2244003F, 0, 0, 0),
+  (0x0302AE90, 0x0001005A, 0, 0, 0),
+  (0x03030100, 0x80000011, 0, 0, 0),
+  # Random scan off
+  (0x0303031C, 0x00000000, 0, 0, 0),
+  (0x03030320, 0x00000000, 0, 0, 0),
+  (0x03030324, 0x00000000, 0, 0, 0),
+  (0x03030328, 0x00000000, 0, 0, 0),
+  (0x0303032C, 0x00000000, 0, 0, 0),
+  (0x03030100, 0x80000011, 0, 0, 0),
+  # CRG：DLL output clock
+  (0x010000AC, 0x00080005, 0, 0, 0),
+  (0x010000AC, 0x00080001, 0, 0, 0),
+  (0x010000E4, 0x00080005, 0, 0, 0),
+  (0x010000E4, 0x00080001, 0, 0, 0),
+  (0x010000EC, 0x00080005, 0, 0, 0),
+  (0x010000EC, 0x00080001, 0, 0, 0),
+  (0x010000AC, 0x00080003, 0, 0, 0),
+  (0x010000E4, 0x00080003, 0, 0, 0),
+  (0x010000EC, 0x00080003, 0, 0, 0),
+  (0x01000002, 0x00000000, 0, 0, 0),
+  (0x0100002C, 0x00000000, 0, 0, 0),
+  # CORE CTRL：VDD, MVDD, OSCVDD selection
+  (0x02000040, 0x0020C208, 0, 0, 0),
+  (0x02000044, 0x0000448A, 0, 0, 0),
+  (0x02000048, 0x00002088, 0, 0, 0),
+  # Auto initialization check enable
+  # (0x02000084, 0x00000002, 0, 0, 0),
+  # CMD TOP：DCS&MCS unlock
+  (0x02001020, 0x5A5A5A5A, 0, 0, 0),
+  # LTC function uses data stored in flash, not expected for use in RB4
+  # LTC on   Brightnesss compensation with temperature variations
+  # (0x0302AE68, 0x00000001, 0, 0, 0),
+  # (0x02003004, 0x00B3635B, 0, 0, 0),
+  # (0x02003004, 0x05B1DBA5, 0, 0, 0),
+  # LTC off
+  (0x0302AE68, 0x00000000, 0, 0, 0),
+  # PMC
+  # Set the default value.  Required before customize the value
+  (0x02003004, 0x0003635B, 0, 0, 0),
+  # Set the min and max temperature value. Bit [19:10]: min T, bit[9:0]:max.
+  # When temperature is out of the range, the errorflag will be triggered.
+  (0x02003004, 0x05B1DBA5, 0, 0, 0),
+  # Error interruption configuration
+  (0x02000004, 0x00000202, 0, 0, 0),
+  # FMC transfer overtime interruption (not using flash)
+  # (0x0200501C, 0x00006020, 0, 0, 0),
+  # BCMG, Demura parameters check error interruption
+  # (0x03000090, 0xC0000000, 0, 0, 0),
+  # MIPI Video Config, Bit 12 and 16 are used for interruption configurations.
+  # They can only be configured once.
+  # Red Set
+  (0x03040000, 0x00011103, 1, 1, 0),
+  # Green set
+  (0x03040000, 0x00015103, 2, 1, 0),
+  # Blue set
+  (0x03040000, 0x00019103, 4, 1, 0),
+  # ESD
+  (0x02000004, 0x00000200, 0, 0, 0),
+  # Error flag pin will not be routed on RB4 flex
+  # Error flag IO multiplexing setting
+  (0x01001038, 0x00000001, 0, 0, 0),
+  # Flip/Mirror/Offset functions, set to default values used in JBD FW
+  (0x03030004, 0x00000000, 1, 0, 0),
+  (0x03030008, 0x00008081, 1, 0, 0),
+  (0x0300015C, 0x20080008, 1, 0, 0),
+  (0x03030004, 0x00000001, 2, 0, 0),
+  (0x03030008, 0x00008081, 2, 0, 0),
+  (0x0300015C, 0x60080008, 2, 0, 0),
+  (0x03030004, 0x00000000, 4, 0, 0),
+  (0x03030008, 0x00008081, 4, 0, 0),
+  (0x0300015C, 0x20080008, 4, 0, 0),
+], dtype=np.uint32)
+
+# write register command byte by JbdPanel value
+_WRITE_REGISTER_CMDS = {
+  JbdPanel.all.value[0]: JbdControlMsg.write_register_all.value,
+  JbdPanel.red.value[0]: JbdControlMsg.write_register_red.value,
+  JbdPanel.green.value[0]: JbdControlMsg.write_register_green.value,
+  JbdPanel.blue.value[0]: JbdControlMsg.write_register_blue.value,
+}
+
+def _pack_init_steps(steps, panel):
+  """Packs the rows of an init step table into write register commands.
+
+  Args:
+    steps:
+      np.ndarray of rows, see _PASS_THRU_INIT_STEPS
+    panel:
+      JbdPanel, the panel(s) being initialized
+
+  Returns:
+    list of (bytes, delay_ms), the back to back 12 byte commands to send before
+    each delay
+  """
+  panel_val = panel.value[0]
+  rows = [(address, data, step_panel or panel_val, delay_ms)
+          for address, data, step_panel, always, delay_ms in steps.tolist()
+          if (not step_panel or always or panel == JbdPanel.all or
+              step_panel == panel_val)]
+  buf = bytearray(12 * len(rows))
+  batches = []
+  start = 0
+  for i, (address, data, row_panel, delay_ms) in enumerate(rows):
+    struct.pack_into(">cII3s", buf, 12 * i, _WRITE_REGISTER_CMDS[row_panel],
+                     address, data, CMD_SUFFIX)
+    if delay_ms or i == len(rows) - 1:
+      batches.append((bytes(buf[12 * start:12 * (i + 1)]), delay_ms))
+      start = i + 1
+  return batches
+
+# the init sequence is constant, pack it once per panel choice at import
+_PASS_THRU_INIT_MSGS = {panel: _pack_init_steps(_PASS_THRU_INIT_STEPS, panel)
+                        for panel in JbdPanel}
+
+@functools.lru_cache(maxsize=1024)
+def _build_write_register_msg(cmd_byte: bytes, reg_address, reg_data) -> bytes:
+  """Builds a 12 byte write register command.
+
+  Cached, the same (panel, address, data) writes are repeated on every init.
+
+  Args:
+    cmd_byte:
+      bytes, one of the JbdControlMsg.write_register_* values
+    reg_address:
+      tuple of 4 bytes, or str of 4 bytes as "0xXXXXXXXX"
+    reg_data:
+      tuple of 4 bytes, or str of 4 bytes as "0xXXXXXXXX"
+
+  Returns:
+    bytes, the command ready to send
+  """
+  if isinstance(reg_address, str):
+    reg_address = bytes.fromhex(reg_address.removeprefix("0x"))
+  if isinstance(reg_data, str):
+    reg_data = bytes.fromhex(reg_data.removeprefix("0x"))
+  # cmd + address + data is 9 bytes, no padding needed before the suffix
+  return b"".join((cmd_byte, bytes(reg_address), bytes(reg_data), CMD_SUFFIX))
+
+@functools.lru_cache(maxsize=128)
+def _build_msg_cached(ctrl_msg: bytes) -> bytes:
+  """Builds a 12 byte command from a fixed ctrl_msg.
+
+  Cached, most commands are sent with the same few payloads over and over.
+
+  Args:
+    ctrl_msg:
+      bytes, the command byte and its payload, at most 9 bytes
+
+  Returns:
+    bytes, the command ready to send
+  """
+  return ctrl_msg + _PADDING[len(ctrl_msg)] + CMD_SUFFIX
+
+# frames of the commands that never take a payload, built once at import
+_SYSTEM_RESET_FRAME = _build_msg_cached(_CMD_SYSTEM_RESET)
+_INIT_FRAME = _build_msg_cached(JbdControlMsg.initialize_panel.value)
+_LOAD_GAMMA_FRAME = _build_msg_cached(JbdControlMsg.load_gamma_data.value)
+_I2C_ENABLE_FRAME = _build_msg_cached(JbdControlMsg.i2c_interface_enable.value)
+_GET_FIRMWARE_FRAME = _build_msg_cached(JbdControlMsg.get_firmware.value)
+_CLEAR_DISPLAY_FRAME = _build_msg_cached(JbdControlMsg.clear_display.value)
+
+def _read_csv_rows(path):
+  """Reads the rows of str fields of a CSV file.
+
+  Same rows as np.genfromtxt(path, delimiter=",", dtype=str, skip_header=1,
+  comments="#"), genfromtxt converts line by line in Python and is slow for the
+  1000+ line gamma LUT files.
+
+  Args:
+    path:
+      str, path to the csv file, the first line is a header
+
+  Returns:
+    list of lists of str
+  """
+  with open(path, newline="") as f:
+    next(f, None)
+    lines = (line.split("#", 1)[0].strip() for line in f)
+    return [[field.strip() for field in row]
+            for row in csv.reader(line for line in lines if line)]
+
+@functools.lru_cache(maxsize=8)
+def _load_register_pairs(path, mtime):
+  """Reads an address/data CSV (e.g. a gamma LUT) into 4 byte pairs.
+
+  Cached by (path, mtime), so a file is only parsed again once it changed.
+
+  Args:
+    path:
+      str, path to the csv file of "0xXXXXXXXX" address/data pairs
+    mtime:
+      float, os.path.getmtime(path), only used as part of the cache key
+
+  Returns:
+    tuple of (bytes, bytes), the address and data of each row
+  """
+  return tuple((bytes.fromhex(addr.removeprefix("0x")),
+                bytes.fromhex(data.removeprefix("0x")))
+               for addr, data, *_ in _read_csv_rows(path))
+
+def _rle_encode_array(data):
+  """RLE encodes a 1D np.uint8 array into (value, count) byte pairs.
+
+  Runs longer than 255 are split into 255 long pieces plus the remainder.
+  Run detection and the output are built with numpy, not a Python loop.
+
+  Args:
+    data:
+      np.ndarray of np.uint8, 1D
+
+  Returns:
+    np.ndarray of np.uint8, the pairs flattened (value, count, value, ...)
+  """
+  if not data.size:
+    return np.empty(0, dtype=np.uint8)
+  bounds = np.concatenate(([0], np.flatnonzero(data[1:] != data[:-1]) + 1,
+                           [data.size]))
+  run_lengths = np.diff(bounds)
+  if run_lengths.max() <= 255:
+    # usual case for images, one pair per run, no splitting needed
+    out = np.empty((run_lengths.size, 2), dtype=np.uint8)
+    out[:, 0] = data[bounds[:-1]]
+    out[:, 1] = run_lengths
+    return out.ravel()
+  pieces = (run_lengths + 254) // 255
+  ends = np.cumsum(pieces) - 1  # index of the last piece of each run
+  out = np.empty((ends[-1] + 1, 2), dtype=np.uint8)
+  out[:, 0] = np.repeat(data[bounds[:-1]], pieces)
+  out[:, 1] = 255
+  out[ends, 1] = run_lengths - 255 * (pieces - 1)
+  return out.ravel()
+
 class Jbd4020SerialUart(serial.Serial):
   """Serial Uart for JBD control board."""
 
+  _batch = None  # list of queued 12 byte commands while inside batch()
+
   def __init__(self, *args, **kwargs):
     """Create serial instance with specified port."""
     self.logger = logging.getLogger()
@@ -253,6 +689,8 @@ class Jbd4020SerialUart(serial.Serial):
     kwargs["inter_byte_timeout"] = kwargs.pop("inter_byte_timeout", 3)
     self.read_timeout = kwargs.pop("read_timeout", 5 )
     super().__init__(**kwargs)
+    if hasattr(self, "set_buffer_size"):  # only available on Windows
+      self.set_buffer_size(rx_size=UART_BUFFER_SIZE, tx_size=UART_BUFFER_SIZE)
 
   def send(self, msg: bytes):
     """Write the msg to the serial/uart port.
@@ -266,39 +704,30 @@ class Jbd4020SerialUart(serial.Serial):
     Raises:
       None
     """
-    caller_func = inspect.stack()[1][3]  # this is here for debugging
-    if caller_func == "query":
-      caller_func = inspect.stack()[2][3]
-    if len(msg) == 12:
-      self.logger.debug("tx: %s - %s",
-                        "".join("{:02x}".format(x) for x in msg),
-                        caller_func)
-    else:
-      # don"t print huge messages
-      self.logger.debug("tx: %s ... %s - %s",
-                        "".join("{:02x}".format(x) for x in msg[:12]),
-                        "".join("{:02x}".format(x) for x in msg[-6:]),
-                        caller_func)
-    this_block = msg[0:12]
-    # make sure the UART is clear of any left over garbage in the buffers
-    self.reset_input_buffer()
-    self.reset_output_buffer()
-    self.write(bytearray(this_block))
-    # split the data_flow in to 3000byte blocks and send an ACK each time
-    # this was reverse engineered using wire shark and the CTRL-BRD app.
-    # TODO(b/267195219): see if this can be done with longer timeouts.
-    for x in range(12, len(msg), 3000):
-      if x + 3000 > len(msg):
-        this_block = msg[x:]  # TODO: if the last block is len 1 it might cause a type error..
+    if self.logger.isEnabledFor(logging.DEBUG):
+      # caller name is only used in the debug output
+      caller_func = sys._getframe(1).f_code.co_name
+      if caller_func == "query":
+        caller_func = sys._getframe(2).f_code.co_name
+      if len(msg) == 12:
+        self.logger.debug("tx: %s - %s",
+                          msg.hex(),
+                          caller_func)
       else:
-        this_block = msg[x:x+3000]
-      self.write(bytearray(this_block))
-      self.write(b"")  # write ACK? this is not documented
-      # # below was done to get an error, send/query will have to be refactored to incorporate this.
-      # r = self.read_all()
-      # if "Received" in r.decode(errors="backslashreplace"):
-      #   print(r)
-      #   raise RuntimeError("Error detected while writing data flow")
+        # don"t print huge messages
+        self.logger.debug("tx: %s ... %s - %s",
+                          msg[:12].hex(),
+                          msg[-6:].hex(),
+                          caller_func)
+    # discard any left over garbage from a previous response
+    if self.in_waiting:
+      self.read(self.in_waiting)
+    # send the command and any data_flow in one write and let the driver/USB
+    # stack do the packetizing; the old 3000 byte blocks + empty "ACK" writes
+    # only added a driver round trip per block.
+    self.write(msg)
+    if len(msg) > 12:
+      self.flush()
 
   def query(self, msg: bytes, response_delay=0) -> bytearray:
     """Send a message and get the response / ACK.
@@ -313,19 +742,38 @@ class Jbd4020SerialUart(serial.Serial):
     Raises:
       None
     """
-    caller_func = inspect.stack()[1][3]
+    caller_func = sys._getframe(1).f_code.co_name
+    if self._batch is not None:
+      if (len(msg) == 12 and not response_delay and
+          bytes(msg[0:1]) not in _READ_CMDS):
+        self._batch.append(bytes(msg))
+        return bytearray()
+      # can't be queued, keep the order by sending what is queued first
+      self._flush_batch()
     self.send(msg)
     time.sleep(response_delay)
     read_timeout = time.time() + self.read_timeout
-    #print(self.in_waiting)
-    while not self.in_waiting:
-      if time.time() > read_timeout:
-        raise TimeoutError(f"No response from device - {caller_func}")
-      time.sleep(0.01)  # don"t pin the CPU
+    # every response starts with a 12 byte header: block in the driver (up to
+    # self.timeout per read) until it is in.  Reads get header[1:5] bytes of
+    # data_flow + a checksum behind it, which can come in later USB packets,
+    # so wait for all of it.  No sleeps, each read returns as soon as the
+    # bytes are there.
     buffer = bytearray()
-    while self.in_waiting:
-      time.sleep(0.1)  # some devices pause between lines...
-      buffer += self.read_all()
+    expected = 12
+    while True:
+      chunk = self.read(max(expected - len(buffer), self.in_waiting))
+      buffer += chunk
+      if expected == 12 and len(buffer) >= 12:
+        expected += self._response_flow_len(msg, buffer)
+      if len(buffer) >= expected and not self.in_waiting:
+        break
+      if not chunk and time.time() > read_timeout:
+        if not buffer:
+          raise TimeoutError(f"No response from device - {caller_func}")
+        if len(buffer) < expected:
+          self.logger.warning("short response, %d of %d bytes - %s",
+                              len(buffer), expected, caller_func)
+        break
     if buffer[0:2].decode(errors="backslashreplace") == "Rx":
       self.logger.warning("Error from %s: %s - %s",
                           self.alias,
@@ -340,9 +788,10 @@ class Jbd4020SerialUart(serial.Serial):
     # increased to 73.  Base message 13 + 5 bytes * 12 possible indices
     # (12 indices are outlined in Appendix 1 of Comm Protocol V2.2.4)
     if len(buffer) <= 73:
-      self.logger.debug("rx: %s - %s",
-                        "".join("{:02x}".format(x) for x in buffer),
-                        caller_func)
+      if self.logger.isEnabledFor(logging.DEBUG):
+        self.logger.debug("rx: %s - %s",
+                          buffer.hex(),
+                          caller_func)
     else:
       # truncate large messages
       self.logger.warning("Truncated message.  rx len: %d, info?: %s",
@@ -350,12 +799,86 @@ class Jbd4020SerialUart(serial.Serial):
                         buffer[-150:].decode(errors='backslashreplace').strip())
       #print(f"rx len: {len(buffer)}, info?:"
       #      f"{buffer[-150:].decode(errors='backslashreplace').strip()}")
-      self.logger.debug("rx: %s ... %s - %s",
-                        "".join("{:02x}".format(x) for x in buffer[:12]),
-                        "".join("{:02x}".format(x) for x in buffer[-10:]),
-                        caller_func)
+      if self.logger.isEnabledFor(logging.DEBUG):
+        self.logger.debug("rx: %s ... %s - %s",
+                          buffer[:12].hex(),
+                          buffer[-10:].hex(),
+                          caller_func)
     return buffer
 
+  @staticmethod
+  def _response_flow_len(msg, header):
+    """Returns the data_flow + checksum byte count behind a response header.
+    """
+    if len(msg) != 12 or header[0:1] != msg[0:1]:
+      return 0  # ACK of a data_flow write, or an "Rx..." error
+    if bytes(msg[0:1]) not in _FLOW_RESPONSE_CMDS:
+      return 0
+    flow_len = int.from_bytes(header[1:5], "big")
+    return flow_len + 1 if flow_len else 0
+
+  @contextlib.contextmanager
+  def batch(self):
+    """Queues the commands sent inside the with block and sends them at once.
+
+    For groups of small commands that only get an ACK back (display enable,
+    mirror, dither, set_register, ...), all of them go out in a single write
+    and the ACKs are read afterwards, instead of a full round trip per command.
+    query() returns an empty bytearray for a queued command.  Reads, commands
+    with a response_delay and ones with a data_flow (images) are not queued,
+    they are sent right away after the ones already queued.  If the block
+    raises, the queued commands are dropped, not sent.
+
+    Yields:
+      list, filled with the 12 byte ACKs, one per queued command, on exit
+
+    Raises:
+      TimeoutError: if not all of the ACKs are received
+    """
+    if self._batch is not None:  # nested, the outer block sends everything
+      yield self._batch_acks
+      return
+    self._batch = []
+    self._batch_acks = []
+    try:
+      yield self._batch_acks
+    except BaseException:
+      self._batch = None  # half a config must not reach the hardware
+      raise
+    try:
+      self._flush_batch()
+    finally:
+      self._batch = None
+
+  def _flush_batch(self):
+    """Sends the commands queued by batch(), see _write_batch."""
+    msgs = b"".join(self._batch)
+    self._batch.clear()
+    self._batch_acks.extend(self._write_batch(msgs))
+
+  def _write_batch(self, msgs):
+    """Writes back to back 12 byte commands at once, then reads all the ACKs.
+    """
+    n = len(msgs) // 12
+    if not n:
+      return []
+    if self.logger.isEnabledFor(logging.DEBUG):
+      for i in range(0, len(msgs), 12):
+        self.logger.debug("tx: %s - batch", bytes(msgs[i:i+12]).hex())
+    if self.in_waiting:
+      self.read(self.in_waiting)
+    self.write(msgs)
+    resp = self.read(12 * n)
+    if len(resp) < 12 * n:
+      raise TimeoutError(f"Only {len(resp) // 12} of {n} ACKs received - "
+                         "batch")
+    acks = [resp[i:i+12] for i in range(0, len(resp), 12)]
+    for i, ack in enumerate(acks):
+      if ack[0:1] != msgs[12*i:12*i+1] or ack[9:12] != CMD_SUFFIX:
+        self.logger.warning("unexpected ACK %s for %s - batch", ack.hex(),
+                            bytes(msgs[12*i:12*i+12]).hex())
+    return acks
+
 
 class Jbd4020CtrlBrd(Jbd4020SerialUart):
   """JBD 4020 Control Board API."""
@@ -393,8 +916,15 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
     self.power_channel_avee = kwargs.pop("power_channel_avee", None)
     self.write_gamma = kwargs.pop("write_gamma", None)
     self.panel = kwargs.pop("panel", JbdPanel.all)
+    self._cb_ver_cache = None  # see check_control_board_fw_version
     super().__init__(*args, **kwargs)
     self.cb_fw_version = self.check_control_board_fw_version()
+    # write register cmd byte per panel, per color writes need FW >= V1.14.21
+    self._wr_cmd = {panel: _WRITE_REGISTER_CMDS[panel.value[0]]
+                    for panel in JbdPanel
+                    if self.cb_fw_version[0] >= 5 or panel == JbdPanel.all}
+    # (reg_address, panel) -> writer, see _reg_writer
+    self._reg_writers = {}
 
   def _get_padding(self, msg):
     """Add padding to the command message.
@@ -402,16 +932,20 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
        The command message has to be padded in the middle with b'x00'
        to be 12 bytes long.
     """
-    return b"\x00" * (12 - (len(msg) + len(CMD_SUFFIX)))
+    return _PADDING[len(msg)]
 
   def _bytes_to_hexstring(self, data):
-    return "".join("{:02x}".format(x) for x in data)
+    return bytes(data).hex()
 
   def _bytes_to_int(self, data):
-    return int(self._bytes_to_hexstring(data), 16)
+    return int.from_bytes(data, "big")
 
   def _build_msg(self, msg):
-    return bytearray(msg) + self._get_padding(msg) + CMD_SUFFIX
+    # bytearray(12) is already zero padded, copy in the cmd and the suffix
+    buf = bytearray(12)
+    buf[:len(msg)] = msg
+    buf[9:] = CMD_SUFFIX
+    return buf
 
   def _parse_data_flow(self, data):
     """Sometimes we have a data_flow after the command."""
@@ -420,19 +954,29 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
       return data[1:9].decode(errors="backslashreplace")
     flow_len = self._bytes_to_int(data[1:5])
     data_flow = data[12:12+flow_len]
-    chk = data[-1].to_bytes(1, "big")
-    cchk = self._calc_xor_checksum(data[12:-1])
+    chk = bytes(data[-1:])
+    cchk = self._calc_xor_checksum(memoryview(data)[12:-1])
     if cchk != chk:
       self.logger.warning("data_flow checksum does not match. %s <> %s",
                           cchk, chk)
     return data_flow
 
+  def _build_flow_msg(self, header, data_flow):
+    """Builds header + data_flow + xor checksum in one preallocated buffer.
+
+    Sent by send() in a single write, see Jbd4020SerialUart.send.
+    """
+    msg = bytearray(len(header) + len(data_flow) + 1)
+    msg[:len(header)] = header
+    msg[len(header):-1] = data_flow
+    msg[-1:] = self._calc_xor_checksum(data_flow)
+    return msg
+
   @staticmethod
   def _calc_xor_checksum(data):
-    chk = 0
-    for b in data:
-      chk ^= b
-    return chk.to_bytes(1, "big")
+    # data_flow can be ~1MB for an image, reduce it in numpy not python
+    chk = np.bitwise_xor.reduce(np.frombuffer(data, dtype=np.uint8))
+    return bytes((int(chk),))
 
   @ staticmethod
   def _calc_temp_from_value(value):
@@ -451,8 +995,8 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
       None
     """
 
-    ctrl_msg = JbdControlMsg.system_reset.value
-    return self.query(self._build_msg(ctrl_msg), response_delay=4)
+    self._cb_ver_cache = None
+    return self.query(_SYSTEM_RESET_FRAME, response_delay=4)
 
   def set_reset_pin(self, value):
     """Set the reset pin high or low.
@@ -468,8 +1012,8 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
       None
     """
 
-    ctrl_msg = JbdControlMsg.control_panel_reset.value + bytearray([value])
-    return self.query(self._build_msg(ctrl_msg))
+    ctrl_msg = _CMD_CONTROL_PANEL_RESET + bytes((value,))
+    return self.query(_build_msg_cached(ctrl_msg))
 
   def set_hdmi(self, enable=False):
     """Set HDMI enabled or disabled.
@@ -489,8 +1033,8 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
       value = 1
     else:
       value = 0
-    ctrl_msg = JbdControlMsg.set_hdmi.value + bytearray([value])
-    return self.query(self._build_msg(ctrl_msg))
+    ctrl_msg = _CMD_SET_HDMI + bytes((value,))
+    return self.query(_build_msg_cached(ctrl_msg))
 
   def power_on_sequence(self, **kwargs):
     """Power on the panel per the device spec.
@@ -605,149 +1149,7 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
       None
     """
     self.logger.info("Initializing panel: %s, with pass thru method", panel)
-    ## SRAM Initialization
-    # Switch off PWM CLK
-    self.set_register("0x03030300", "0x00000010", panel)
-    # Panel Initialization
-    self.set_register("0x03030144", "0x40000000", panel)
-    # MUTE set max resolution
-    self.set_register("0x030001C8", "0x0029F1FF", panel)
-    # Background gray value set 0
-    self.set_register("0x030001B8", "0x00000000", panel)
-    # MUTE enable
-    self.set_register("0x030001C4", "0x00000001", panel)
-    # Display background color mode
-    self.set_register("0x03000180", "0x2003d01B", panel)
-    # Display port enable
-    self.set_register("0x03030100", "0x80000011", panel)
-    self.set_register("0x03040008", "0x00000001", panel)
-    # wait for 20ms
-    time.sleep(0.02)
-    # XDP reset
-    self.set_register("0x0100003C", "0x20021F3F", panel)
-    # XDP reset release
-    self.set_register("0x0100003C", "0x2002003F", panel)
-    # Clear MIPI interruption
-    self.set_register("0x02006720", "0xFFFFFFFF", panel)
-    self.set_register("0x02006724", "0xFFFFFFFF", panel)
-    self.set_register("0x02006728", "0xFFFFFFFF", panel)
-    # Error count clear
-    self.set_register("0x02006740", "0xFFFFFFFF", panel)
-    # wait for 1s
-    time.sleep(1.0)
-    # MIPI PCS
-    self.set_register("0x02007228", "0x000C33FF", panel)
-    self.set_register("0x020072C0", "0x00000001", panel)
-    self.set_register("0x020072C0", "0x00000000", panel)
-    # MIPI CTRL
-    self.set_register("0x0200600C", "0x00000001", panel)
-    self.set_register("0x020060A8", "0x00002263", panel)
-    self.set_register("0x02006014", "0x00000200", panel)
-    self.set_register("0x02006200", "0x00000001", panel)
-    # Set MIPI image data mode
-    # 0x00000000 video mode (JBD control board uses video mode)
-    # 0000000001 command mode
-    self.set_register("0x02006230", "0x00000000", panel)
-    self.set_register("0x02006700", "0x001FFFFF", panel)
-    self.set_register("0x02006704", "0x003FFFFF", panel)
-    self.set_register("0x02006708", "0x00181BFF", panel)
-    self.set_register("0x02006160", "0x0001FFFF", panel)
-    # Enable MIPI Detection function
-    self.set_register("0x02006788", "0x0200001F", panel)
-    self.set_register("0x02006000", "0x00020002", panel)
-    self.set_register("0x01000090", "0x00600F86", panel)
-    self.set_register("0x02006000", "0x00000002", panel)
-    # XDP: resolution, refresh , pixel current, algorithm setting
-    # Can't set these as set_register blasts to all panels,
-    # but need to set R,G,B to different values
-    # MIPI signal select, b9: 0-video mode; 1-cmd mode; b14~15: 0-R, 1-G, 2-B
-    if panel == JbdPanel.all or panel == JbdPanel.red:
-      self.set_register("0x03040000", "0x00000103", JbdPanel.red) #R
-    if panel == JbdPanel.all or panel == JbdPanel.green:
-      self.set_register("0x03040000", "0x00004103", JbdPanel.green) #G
-    if panel == JbdPanel.all or panel == JbdPanel.blue:
-      self.set_register("0x03040000", "0x00008103", JbdPanel.blue) #B
-    # set 640x480 (0x01DF = 639, 0x027F = 439)
-    self.set_register("0x030000D0", "0x01DF027f", panel)
-    self.set_register("0x03000080", "0x00000100", panel)
-    self.set_register("0x03030300", "0x00000000", panel)
-    self.set_register("0x03041004", "0x00000001", panel)
-    # 54M(60Hz)
-    self.set_register("0x0100003C", "0x2244003F", panel)
-    self.set_register("0x0302AE90", "0x0001005A", panel)
-    self.set_register("0x03030100", "0x80000011", panel)
-    # Random scan off
-    self.set_register("0x0303031C", "0x00000000", panel)
-    self.set_register("0x03030320", "0x00000000", panel)
-    self.set_register("0x03030324", "0x00000000", panel)
-    self.set_register("0x03030328", "0x00000000", panel)
-    self.set_register("0x0303032C", "0x00000000", panel)
-    self.set_register("0x03030100", "0x80000011", panel)
-    # CRG：DLL output clock
-    self.set_register("0x010000AC", "0x00080005", panel)
-    self.set_register("0x010000AC", "0x00080001", panel)
-    self.set_register("0x010000E4", "0x00080005", panel)
-    self.set_register("0x010000E4", "0x00080001", panel)
-    self.set_register("0x010000EC", "0x00080005", panel)
-    self.set_register("0x010000EC", "0x00080001", panel)
-    self.set_register("0x010000AC", "0x00080003", panel)
-    self.set_register("0x010000E4", "0x00080003", panel)
-    self.set_register("0x010000EC", "0x00080003", panel)
-    self.set_register("0x01000002", "0x00000000", panel)
-    self.set_register("0x0100002c", "0x00000000", panel)
-    # CORE CTRL：VDD, MVDD, OSCVDD selection
-    self.set_register("0x02000040", "0x0020C208", panel)
-    self.set_register("0x02000044", "0x0000448A", panel)
-    self.set_register("0x02000048", "0x00002088", panel)
-    # Auto initialization check enable
-    # self.set_register("0x02000084", "0x00000002", panel)
-    # CMD TOP：DCS&MCS unlock
-    self.set_register("0x02001020", "0x5a5a5a5a", panel)
-    # LTC function uses data stored in flash, not expected for use in RB4
-    # LTC on   Brightnesss compensation with temperature variations
-    # self.set_register("0x0302AE68", "0x00000001", panel)
-    # self.set_register("0x02003004", "0x00B3635B", panel)
-    # self.set_register("0x02003004", "0x05B1DBA5", panel)
-    # LTC off
-    self.set_register("0x0302AE68", "0x00000000", panel)
-    # PMC
-    # Set the default value.  Required before customize the value
-    self.set_register("0x02003004", "0x0003635B", panel)
-    # Set the min and max temperature value. Bit [19:10]: min T, bit[9:0]:max.
-    # When temperature is out of the range, the errorflag will be triggered.
-    self.set_register("0x02003004", "0x05B1DBA5", panel)
-    # Error interruption configuration
-    self.set_register("0x02000004", "0x00000202", panel)
-    # FMC transfer overtime interruption (not using flash)
-    # self.set_register("0x0200501C", "0x00006020", panel)
-    # BCMG, Demura parameters check error interruption
-    # self.set_register("0x03000090", "0xC0000000", panel)
-    # MIPI Video Config, Bit 12 and 16 are used for interruption configurations.
-    # They can only be configured once.
-    # Red Set
-    self.set_register("0x03040000", "0x00011103", JbdPanel.red)
-    # Green set
-    self.set_register("0x03040000", "0x00015103", JbdPanel.green)
-    # Blue set
-    self.set_register("0x03040000", "0x00019103", JbdPanel.blue)
-    # ESD
-    self.set_register("0x02000004", "0x00000200", panel)
-    # Error flag pin will not be routed on RB4 flex
-    # Error flag IO multiplexing setting
-    self.set_register("0x01001038", "0x00000001", panel)
-    # Flip/Mirror/Offset functions, set to default values used in JBD FW
-    if panel == JbdPanel.all or panel == JbdPanel.red:
-      self.set_register("0x03030004", "0x00000000", JbdPanel.red)
-      self.set_register("0x03030008", "0x00008081", JbdPanel.red)
-      self.set_register("0x0300015C", "0x20080008", JbdPanel.red)
-    if panel == JbdPanel.all or panel == JbdPanel.green:
-      self.set_register("0x03030004", "0x00000001", JbdPanel.green)
-      self.set_register("0x03030008", "0x00008081", JbdPanel.green)
-      self.set_register("0x0300015C", "0x60080008", JbdPanel.green)
-    if panel == JbdPanel.all or panel == JbdPanel.blue:
-      self.set_register("0x03030004", "0x00000000", JbdPanel.blue)
-      self.set_register("0x03030008", "0x00008081", JbdPanel.blue)
-      self.set_register("0x0300015C", "0x20080008", JbdPanel.blue)
+    self._write_init_steps(_PASS_THRU_INIT_MSGS[panel])
 
   def get_mirror_offset_pass_thru(self, panel: JbdPanel):
     """Get the SRAM and VO L-R & U-D mirror (flip) & X & Y offset configuration.
@@ -769,9 +1171,11 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
     if panel == JbdPanel.all:
       raise NotImplementedError("Only one panel at a time implemented")
     cfg = JbdMirrorOffsetConfig()
-    cfg.sram_mirror_flip = int(self.get_register(panel, "0x03030004"), base=16)
-    cfg.sram_offset = int(self.get_register(panel, "0x03030008"), base=16)
-    cfg.vo = int(self.get_register(panel, "0x0300015C"), base=16)
+    cfg.sram_mirror_flip = int.from_bytes(
+        self.get_register_raw(panel, 0x03030004), "big")
+    cfg.sram_offset = int.from_bytes(
+        self.get_register_raw(panel, 0x03030008), "big")
+    cfg.vo = int.from_bytes(self.get_register_raw(panel, 0x0300015C), "big")
     cfg.recalculate()
     return cfg
 
@@ -812,21 +1216,19 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
       lr_mirror = old.sram_lr_mirror
     if ud_mirror is None:
       ud_mirror = old.sram_ud_mirror
-    sram_mirror_flip = int(ud_mirror) << 1 | int(lr_mirror)
-    #print(hex(sram_mirror_flip))
-    self.set_register("0x03030004", f"0x{(sram_mirror_flip):08x}", panel)
-    if x_offset > 24: x_offset = 24
-    elif x_offset < 0: x_offset = 0
-    if y_offset > 24: y_offset = 24
-    elif y_offset < 0: x_offset = 0
-    offset_en = int(x_offset > 0 or y_offset > 0)
-    sram_offset = (y_offset << 12 | x_offset << 4 | offset_en)
-    #print(hex(sram_offset))
-    self.set_register("0x03030008", f"0x{(sram_offset):08x}", panel)
-    vo = (int(ud_mirror) << 31 | int(lr_mirror) << 30 | offset_en << 29 |
-          y_offset << 16 | x_offset)
+    sram_mirror_flip, vo_mirror = _MIRROR_BITS[int(ud_mirror) << 1 |
+                                               int(lr_mirror)]
+    x_offset = max(0, min(24, x_offset))
+    y_offset = max(0, min(24, y_offset))
+    sram_offset, vo_offset = _OFFSETS[y_offset][x_offset]
+    vo = vo_mirror | vo_offset
     #print(hex(vo))
-    self.set_register("0x0300015C", f"0x{(vo):08x}", panel)
+    # one pipelined batch, the three writes are a single UART round trip
+    self.set_register_batch([
+      ("0x03030004", sram_mirror_flip.to_bytes(4, "big"), panel),
+      ("0x03030008", sram_offset.to_bytes(4, "big"), panel),
+      ("0x0300015C", vo.to_bytes(4, "big"), panel),
+    ])
 
   def control_panel_reset(self):
     """Wrapper to set the reset pin high then low.
@@ -841,12 +1243,41 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
       None
     """
 
+    self._cb_ver_cache = None
     self.set_reset_pin(1)
     time.sleep(0.2)  # it takes a while to reset
     self.set_reset_pin(0)
-    self.logger.info("Control Board reset started, wait %s sec for board to "
-                     "come back up.", RESET_DELAY)
-    time.sleep(RESET_DELAY)
+    self.logger.info("Control Board reset started, wait up to %s sec for "
+                     "board to come back up.", RESET_DELAY)
+    # return as soon as the board has gone down and answers again, if it is
+    # never seen going down wait the full RESET_DELAY as before
+    start = time.monotonic()
+    deadline = start + RESET_DELAY
+    went_down = False
+    while time.monotonic() < deadline:
+      if not self._probe_alive():
+        went_down = True
+      elif went_down:
+        self.logger.info("Control Board back up after %.1f sec.",
+                         time.monotonic() - start)
+        return
+      time.sleep(RESET_PROBE_INTERVAL)
+
+  def _probe_alive(self, timeout=RESET_PROBE_INTERVAL):
+    """Sends a get firmware command, True if the board answers in timeout sec.
+
+    Polls in_waiting instead of a blocking read, so the port timeouts are left
+    alone.
+    """
+    if self.in_waiting:
+      self.read(self.in_waiting)
+    self.write(_GET_FIRMWARE_FRAME)
+    deadline = time.monotonic() + timeout
+    while self.in_waiting < 12 and time.monotonic() < deadline:
+      time.sleep(0.01)
+    resp = self.read(self.in_waiting)
+    return (resp[0:1] == _GET_FIRMWARE_FRAME[0:1] and
+            resp[9:12] == CMD_SUFFIX)
 
   def initialize_panel(self, resolution: JbdPaneResolutionIdx = None):
     """Initialize the panel.
@@ -881,8 +1312,7 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
       None
     """
     self.logger.debug("Initialize the panel")
-    ctrl_msg = JbdControlMsg.initialize_panel.value
-    return self.query(self._build_msg(ctrl_msg))
+    return self.query(_INIT_FRAME)
 
   def load_gamma_tables(self):
     """Load the gamma tables (from flash memory).
@@ -900,8 +1330,7 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
     """
 
     self.logger.debug("Load gamma tables")
-    ctrl_msg = JbdControlMsg.load_gamma_data.value
-    return self.query(self._build_msg(ctrl_msg))
+    return self.query(_LOAD_GAMMA_FRAME)
 
   def set_panel_resolution(self, resolution: JbdPaneResolutionIdx,
                            panel: JbdPanel = JbdPanel.all):
@@ -920,14 +1349,13 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
       bytearray containing response message from the control board.
     """
 
-    ctrl_msg = JbdControlMsg.set_display_resolution.value
-    msg = ctrl_msg + panel.value + resolution.value
+    msg = _CMD_SET_DISPLAY_RESOLUTION + _PANEL_VAL[panel] + resolution.value
     self.logger.info("Set panel resolution to %sx%s",
                      _PANEL_RESOLUTIONS[resolution][0],
                      _PANEL_RESOLUTIONS[resolution][1])
     self.resolution_idx = resolution
     self._resolution = _PANEL_RESOLUTIONS[resolution]
-    return self.query(self._build_msg(msg))
+    return self.query(_build_msg_cached(msg))
 
   def set_display_enable(self, enable: bool, panel: JbdPanel = JbdPanel.all):
     """Sets the panel enable state.
@@ -947,10 +1375,9 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
       None
     """
 
-    ctrl_msg = JbdControlMsg.display_enable.value
-    msg = ctrl_msg + panel.value + bytearray([int(enable)])
+    msg = _CMD_DISPLAY_ENABLE + _PANEL_VAL[panel] + bytes((int(enable),))
     self.logger.info("Set %s display enable = %s", panel, enable)
-    return self.query(self._build_msg(msg))
+    return self.query(_build_msg_cached(msg))
 
   def deep_power_down(self):
     """Put the panel into Deep Power Down State.
@@ -965,22 +1392,16 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
       None
     """
 
-    # Switch off AA current source
-    register_address = [0x02, 0x00, 0x00, 0x30]
-    register_data = [0x00, 0x00, 0x00, 0x00]
-    self.set_register(register_address, register_data)
-    # Switch off AA PWM Clock
-    register_address = [0x03, 0x03, 0x03, 0x00]
-    register_data = [0x00, 0x00, 0xFF, 0x11]
-    self.set_register(register_address, register_data)
-    # Switch off MIPI LDO
-    register_address = [0x02, 0x00, 0x00, 0x44]
-    register_data = [0x00, 0x04, 0x00, 0x00]
-    self.set_register(register_address, register_data)
-    # Switch off OSC LDO
-    register_address = [0x02, 0x00, 0x00, 0x48]
-    register_data = [0x00, 0x04, 0x00, 0x00]
-    self.set_register(register_address, register_data)
+    self.set_register_batch([
+      # Switch off AA current source
+      ([0x02, 0x00, 0x00, 0x30], [0x00, 0x00, 0x00, 0x00], JbdPanel.all),
+      # Switch off AA PWM Clock
+      ([0x03, 0x03, 0x03, 0x00], [0x00, 0x00, 0xFF, 0x11], JbdPanel.all),
+      # Switch off MIPI LDO
+      ([0x02, 0x00, 0x00, 0x44], [0x00, 0x04, 0x00, 0x00], JbdPanel.all),
+      # Switch off OSC LDO
+      ([0x02, 0x00, 0x00, 0x48], [0x00, 0x04, 0x00, 0x00], JbdPanel.all),
+    ])
 
   def wake(self):
     """Wake all connected panels out of Deep Power Down State.
@@ -1009,9 +1430,8 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
     Raises:
       None
     """
-    ctrl_msg = JbdControlMsg.i2c_interface_enable.value
     self.logger.debug("i2c interface enable")
-    return self.query(self._build_msg(ctrl_msg))
+    return self.query(_I2C_ENABLE_FRAME)
 
   def get_control_board_firmware(self):
     """Get the firmware version from the ctrl brd.
@@ -1028,16 +1448,17 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
     Raises:
       None
     """
-    ctrl_msg = JbdControlMsg.get_firmware.value
-    return self.query(self._build_msg(ctrl_msg))
+    return self.query(_GET_FIRMWARE_FRAME)
 
-  def check_control_board_fw_version(self):
+  def check_control_board_fw_version(self, refresh: bool = False):
     """Get the firmware version from the ctrl brd.
 
-    Uses the built in method in the JBD control board FW.
+    Uses the built in method in the JBD control board FW.  A known version is
+    cached until the next reset, later calls do not go to the board.
 
     Args:
-      None
+      refresh:
+        bool, ask the board again even if a version is cached
 
     Returns:
       cb_ver_int:
@@ -1049,27 +1470,25 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
     Raises:
       None
     """
-    cb_ver_str = self.get_control_board_firmware()[1:9].decode(encoding='UTF-8',
-                                                               errors='ignore')
-    if cb_ver_str in CB_FW_VERSIONS:
-      cb_ver_int = CB_FW_VERSIONS[cb_ver_str]
-    else:
-      cb_ver_int = -1
+    if self._cb_ver_cache is not None and not refresh:
+      return self._cb_ver_cache
+    cb_ver = bytes(self.get_control_board_firmware()[1:9])
+    cb_ver_int = _CB_FW_VERSION_MAP.get(cb_ver, -1)
+    cb_ver_str = cb_ver.decode(encoding='UTF-8', errors='ignore')
 
-    latest_cb_ver_int = max(CB_FW_VERSIONS.values())
-    latest_cb_ver_str = ([k for k, v in CB_FW_VERSIONS.items() if v ==
-                         latest_cb_ver_int][0])
     if cb_ver_int == -1:
       self.logger.warning("Control Board FW version is %s.  This version is "
                           "unknown.  The latest known version is %s",
-                          cb_ver_str, latest_cb_ver_str)
-    elif cb_ver_int < latest_cb_ver_int :
+                          cb_ver_str, _LATEST_CB_VER_STR)
+    elif cb_ver_int < _LATEST_CB_VER_INT:
       self.logger.warning("Control Board FW version is %s.  The latest known "
-                          "version is %s", cb_ver_str, latest_cb_ver_str)
+                          "version is %s", cb_ver_str, _LATEST_CB_VER_STR)
     else:
       self.logger.info("Control Board FW version is %s.  This is the latest "
                        "known version.", cb_ver_str)
 
+    if cb_ver_int != -1:
+      self._cb_ver_cache = (cb_ver_int, cb_ver_str)
     return int(cb_ver_int), cb_ver_str
 
 
@@ -1090,8 +1509,8 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
     """
     if panel == JbdPanel.all:
       raise NotImplementedError("Only one panel at a time implemented")
-    ctrl_msg = JbdControlMsg.read_temp_sensor.value + panel.value
-    resp = self._parse_data_flow(self.query(self._build_msg(ctrl_msg)))
+    ctrl_msg = _CMD_READ_TEMP_SENSOR + _PANEL_VAL[panel]
+    resp = self._parse_data_flow(self.query(_build_msg_cached(ctrl_msg)))
     return resp[1:]
 
   def get_panel_temperature(self, panel: JbdPanel):
@@ -1128,18 +1547,17 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
     if panel == JbdPanel.all:
       raise NotImplementedError("Only one panel at a time implemented")
     #panel = JbdPanel.all
-    # select byte to read out from eFUSE
-    self.set_register([0x02, 0x00, 0x90, 0x0C],
-                      [0x00, 0x00, 0x00, read_byte],
-                      panel)
-
-    # eFUSE enable
-    self.set_register([0x02, 0x00, 0x90, 0x08],
-                      [0x00, 0x00, 0x00, 0x01],
-                      panel)
+    self.set_register_batch([
+      # select byte to read out from eFUSE
+      ([0x02, 0x00, 0x90, 0x0C], [0x00, 0x00, 0x00, read_byte], panel),
+      # eFUSE enable
+      ([0x02, 0x00, 0x90, 0x08], [0x00, 0x00, 0x00, 0x01], panel),
+    ])
+    # the data register only holds the last selected byte, so this wait can
+    # not be shared between bytes
     time.sleep(0.04)
     #return self.get_register(panel, [0x02, 0x00, 0x90, 0x14])[0]
-    read_ba = self.get_register(panel, [0x02, 0x00, 0x90, 0x14])
+    read_ba = self._read_register_flow(panel, [0x02, 0x00, 0x90, 0x14])[1:]
     #print(read_ba)
     if len(read_ba) > 0:
       return read_ba[-1]
@@ -1160,7 +1578,7 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
     Raises:
       None
     """
-    return self.get_register(panel, [0x03, 0x02, 0xAE, 0x90])
+    return self._read_register_flow(panel, [0x03, 0x02, 0xAE, 0x90])[1:]
 
   def get_current(self, panel: JbdPanel):
     """Read the current setting (0x00 to 0xFF).
@@ -1178,17 +1596,7 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
     Raises:
       None
     """
-    read_data = self.get_register(panel, "0x0302AE90")
-    if panel == JbdPanel.all:
-      value_list = []
-      for c in ["red", "green", "blue"]:
-        str = read_data.find(c) + len(c) + 2
-        end = str + 11
-        val_int = hex(int(read_data[str:end], 16) & 0xFF)
-        value_list.append(val_int)
-      return value_list
-    else:
-      return hex(int(read_data, 16) & 0xFF)
+    return self._get_register_masked(panel, "0x0302AE90", 0xFF)
 
   def read_flash_id(self, panel: JbdPanel):
     """Read flash id using register write and read commands.
@@ -1204,11 +1612,11 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
     Raises:
       None
     """
-    self.set_register("0x02005020", "0x000000FF", panel)
-    self.set_register("0x02005024", "0x0000009F", panel)
-    self.set_register("0x02005030", "0x00000030", panel)
-    self.set_register("0x02005038", "0x00000003", panel)
-    self.set_register("0x0200503C", "0x00000085", panel)
+    self.set_register_batch([("0x02005020", "0x000000FF", panel),
+                             ("0x02005024", "0x0000009F", panel),
+                             ("0x02005030", "0x00000030", panel),
+                             ("0x02005038", "0x00000003", panel),
+                             ("0x0200503C", "0x00000085", panel)])
     return(self.get_register(panel, "0x04000000"))
 
   def read_die_id(self, panel: JbdPanel):
@@ -1224,8 +1632,12 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
     Raises:
       None
     """
-    ctrl_msg = JbdControlMsg.read_die_id.value + panel.value
-    return self._parse_data_flow(self.query(self._build_msg(ctrl_msg)))
+    ctrl_msg = _CMD_READ_DIE_ID + _PANEL_VAL[panel]
+    return self._parse_data_flow(self.query(_build_msg_cached(ctrl_msg)))
+
+  def _read_eFUSE_range(self, panel: JbdPanel, first: int, last: int):
+    """Read the eFUSE bytes first..last (inclusive), see _read_eFUSE."""
+    return [self._read_eFUSE(panel, i) for i in range(first, last + 1)]
 
   def read_die_id_raw(self, panel: JbdPanel):
     """Read die id from eFUSE using register write and read commands.
@@ -1245,21 +1657,17 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
 
     if panel == JbdPanel.all:
       raise NotImplementedError("Only one panel at a time implemented")
-    die_id = []
-    for i in range(115, 127+1):
-      die_id.append(self._read_eFUSE(panel, i))
+    die_id = self._read_eFUSE_range(panel, 115, 127)
     #print([hex(x) for x in die_id])
     if die_id[0] is None:
       return f"No ID readback. Check {panel} panel is connected."
     else:
-      for i in range(0, 12 + 1):
-        #print(die_id)
-        if i == 0 or i == 3 or i == 5 or i == 11:
-          die_id[i] = (chr(die_id[i]))
-        else:
-          die_id[i] = (f"{die_id[i]:02X}")
-      # print(die_id)
-      formatted_die_id = "".join(die_id)
+      # bytes 0, 3, 5 and 11 are ASCII characters, the rest print as hex
+      die_id = bytes(die_id)
+      formatted_die_id = (chr(die_id[0]) + die_id[1:3].hex().upper() +
+                          chr(die_id[3]) + die_id[4:5].hex().upper() +
+                          chr(die_id[5]) + die_id[6:11].hex().upper() +
+                          chr(die_id[11]) + die_id[12:].hex().upper())
       return formatted_die_id
 
   def read_ic_version(self, panel: JbdPanel):
@@ -1277,9 +1685,7 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
 
     if panel == JbdPanel.all:
       raise NotImplementedError("Only one panel at a time implemented")
-    ic_id = []
-    for i in range(0x35, 0x37 + 1):
-      ic_id.append(self._read_eFUSE(panel, i))
+    ic_id = self._read_eFUSE_range(panel, 0x35, 0x37)
     #print([hex(x) for x in ic_id])
     if ic_id[0] is None:
       return f"No IC ID readback. Check {panel} panel is connected."
@@ -1302,9 +1708,7 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
 
     if panel == JbdPanel.all:
       raise NotImplementedError("Only one panel at a time implemented")
-    ic_id = []
-    for i in range(0x15, 0x15 + 1):
-      ic_id.append(self._read_eFUSE(panel, i))
+    ic_id = self._read_eFUSE_range(panel, 0x15, 0x15)
     #print([hex(x) for x in ic_id])
     if ic_id[0] is None:
       return f"No I2C efuse readback. Check {panel} panel is connected."
@@ -1341,11 +1745,9 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
     Raises:
       None
     """
-    if value < 0 : value = 0
-    elif value > 8191: value = 8191
+    value = min(8191, max(0, value))
 
-    ctrl_msg = (JbdControlMsg.write_lreg.value + panel.value +
-                value.to_bytes(2, "big"))
+    ctrl_msg = _CMD_WRITE_LREG + _PANEL_VAL[panel] + value.to_bytes(2, "big")
     return self.query(self._build_msg(ctrl_msg))
 
   def get_luminance(self, panel: JbdPanel = JbdPanel.all):
@@ -1361,22 +1763,7 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
     Raises:
       None
     """
-    read_data = self.get_register(panel, "0x0302AE38")
-    #print(read_data)
-    if panel == JbdPanel.all:
-      value_list = []
-      for c in ["red", "green", "blue"]:
-        str = read_data.find(c) + len(c) + 3
-        end = str + 10
-        #print(read_data[str:end])
-        if "None" not in read_data[str:str+4]:
-          val_str = hex(int(read_data[str:end], 16) & int("0x00001FFF", 16))
-        else:
-          val_str = None
-        value_list.append(val_str)
-      return value_list
-    else:
-      return hex(int(read_data, 16) & int("0x00001FFF", 16))
+    return self._get_register_masked(panel, "0x0302AE38", 0x1FFF)
 
   def set_lr_mirror(self, value: int, panel: JbdPanel = JbdPanel.all):
     """Set the panel's left right mirror function.  Uses the control board built
@@ -1396,10 +1783,9 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
     """
     if value != 1 and value != 0:
       raise ValueError("Mirror function expect 0 or 1 input")
-    ctrl_msg = (JbdControlMsg.set_h_mirror.value + panel.value +
-                bytearray([value]))
-    print(f"Writing to LR mirror: {bytearray([value])}")
-    return self.query(self._build_msg(ctrl_msg))
+    ctrl_msg = _CMD_SET_H_MIRROR + _PANEL_VAL[panel] + bytes((value,))
+    self.logger.debug("Writing to LR mirror: %s", value)
+    return self.query(_build_msg_cached(ctrl_msg))
 
   def set_ud_mirror(self, value: int, panel: JbdPanel = JbdPanel.all):
     """Set the panel's up down mirror (flip) function.  Uses the control board
@@ -1419,9 +1805,8 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
     """
     if value != 1 and value != 0:
       raise ValueError("Mirror function expect 0 or 1")
-    ctrl_msg = (JbdControlMsg.set_v_mirror.value + panel.value +
-                bytearray([value]))
-    return self.query(self._build_msg(ctrl_msg))
+    ctrl_msg = _CMD_SET_V_MIRROR + _PANEL_VAL[panel] + bytes((value,))
+    return self.query(_build_msg_cached(ctrl_msg))
 
   def set_random_scan(self, value: int, panel: JbdPanel = JbdPanel.all):
     """Set random scan on/off.  Uses the control board built in function.
@@ -1441,9 +1826,8 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
     ctrl_msg = None
     if value >= 1: value = 1
     else: value = 0
-    ctrl_msg = (JbdControlMsg.random_scan_control.value + panel.value
-                + bytearray([value]))
-    return self.query(self._build_msg(ctrl_msg))
+    ctrl_msg = _CMD_RANDOM_SCAN + _PANEL_VAL[panel] + bytes((value,))
+    return self.query(_build_msg_cached(ctrl_msg))
 
   def set_dither(self, value: int, panel: JbdPanel = JbdPanel.all):
     """Set dither on/off.  Uses the control board built in function.
@@ -1465,9 +1849,8 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
     ctrl_msg = None
     if value >= 1: value = 1
     else: value = 0
-    ctrl_msg = (JbdControlMsg.dither_enable.value + panel.value
-                + bytearray([value]))
-    return self.query(self._build_msg(ctrl_msg))
+    ctrl_msg = _CMD_DITHER_ENABLE + _PANEL_VAL[panel] + bytes((value,))
+    return self.query(_build_msg_cached(ctrl_msg))
 
   def set_current(self, value: int, panel: JbdPanel = JbdPanel.all):
     """Set the panel current (aka Creg) 0-255.
@@ -1487,9 +1870,8 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
     Raises:
       None
     """
-    if value < 0: value = 0
-    elif value > 255: value = 255
-    ctrl_msg = JbdControlMsg.write_creg.value + panel.value + bytearray([value])
+    value = min(255, max(0, value))
+    ctrl_msg = _CMD_WRITE_CREG + _PANEL_VAL[panel] + bytes((value,))
     return self.query(self._build_msg(ctrl_msg))
 
   def _write_creg(self, value: int, panel: JbdPanel = JbdPanel.all):
@@ -1513,10 +1895,10 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
     Raises:
       None
     """
-    if value < 0: value = 0
-    elif value < 255: value = 255
+    value = min(255, max(0, value))
     #print(f"0x{(0x00010000 | value):08x}")
-    self.set_register("0x0302AE90", f"0x{(0x00010000 | value):08x}", panel)
+    write_creg = self._reg_writer("0x0302AE90", panel)
+    write_creg((0x00010000 | value).to_bytes(4, "big"))
 
   def set_register(self, reg_address: Union[list, str],
                    reg_data: Union[list, str],
@@ -1542,23 +1924,83 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
       ValueError: if panel type not red, green, blue, or all
       NotImplemented Error: if FW version < V1.14.21 and panel type is not all
     """
+    return self.query(self._set_register_msg(reg_address, reg_data, panel,
+                                             force_old_fw))
+
+  def _reg_writer(self, reg_address: str, panel: JbdPanel):
+    """Returns a function writing 4 data bytes to one register of panel.
+
+    The command byte + address prefix is built (and checked, see set_register)
+    once per (reg_address, panel), only the data changes between calls.
+    """
+    writer = self._reg_writers.get((reg_address, panel))
+    if writer is None:
+      prefix = self._set_register_msg(reg_address, bytes(4), panel, False)[:5]
+      def writer(reg_data: bytes):
+        return self.query(b"".join((prefix, reg_data, CMD_SUFFIX)))
+      self._reg_writers[(reg_address, panel)] = writer
+    return writer
+
+  def set_register_batch(self, writes, force_old_fw: bool = False):
+    """Set (write) a list of registers in one UART transaction.
+
+    All the write commands are sent back to back in a single write and the
+    ACKs are drained afterwards, instead of a full round trip per register.
+
+    Args:
+      writes:
+        list of (reg_address, reg_data, panel) tuples, same formats as
+        set_register
+      force_old_fw:
+        see set_register
+
+    Returns:
+      list of the 12 byte ACKs, one per write
+
+    Raises:
+      ValueError: if panel type not red, green, blue, or all
+      NotImplemented Error: if FW version < V1.14.21 and panel type is not all
+      TimeoutError: if not all of the ACKs are received
+    """
+    msgs = [self._set_register_msg(reg_address, reg_data, panel, force_old_fw)
+            for reg_address, reg_data, panel in writes]
+    if self._batch is not None:  # inside batch(), sent with the rest
+      self._batch.extend(msgs)
+      return []
+    return self._write_batch(b"".join(msgs))
+
+  def _write_init_steps(self, batches):
+    """Writes prebuilt init command batches, see _pack_init_steps.
+
+    Raises:
+      NotImplemented Error: if FW version < V1.14.21 and a write is not for all
+    """
+    all_cmd = JbdControlMsg.write_register_all.value
+    if (self.cb_fw_version[0] < 5 and
+        any(msgs[::12] != all_cmd * (len(msgs) // 12) for msgs, _ in batches)):
+      self.logger.error("Per color register writes not supported in this FW "
+                        "version.  Please up date to a newer version.")
+      raise NotImplementedError("Per color register writes not supported in "
+                                "this FW version.  Please up date to a newer "
+                                "version.")
+    for msgs, delay_ms in batches:
+      self._write_batch(msgs)
+      if delay_ms:
+        time.sleep(delay_ms / 1000)
+
+  def _set_register_msg(self, reg_address, reg_data, panel, force_old_fw):
+    """Builds the 12 byte write register command, see set_register."""
     #force_old_fw = True
-    if panel == JbdPanel.all:
-      cmd_byte = JbdControlMsg.write_register_all
-    elif panel == JbdPanel.red:
-      cmd_byte = JbdControlMsg.write_register_red
-    elif panel == JbdPanel.green:
-      cmd_byte = JbdControlMsg.write_register_green
-    elif panel == JbdPanel.blue:
-      cmd_byte = JbdControlMsg.write_register_blue
-    else:
-      self.logger.error("Invalid %s type", panel)
-      raise ValueError(f"The {panel} panel type is not supported."
-                       f"Expect one of: {[e.value for e in JbdPanel]}")
-    if (self.cb_fw_version[0] < 5 and (panel != JbdPanel.all)):
+    cmd_byte = self._wr_cmd.get(panel)
+    if cmd_byte is None:
+      if not isinstance(panel, JbdPanel):
+        self.logger.error("Invalid %s type", panel)
+        raise ValueError(f"The {panel} panel type is not supported."
+                         f"Expect one of: {[e.value for e in JbdPanel]}")
+      # only JbdPanel.all is in _wr_cmd on old FW
       if force_old_fw:
         panel = JbdPanel.all
-        cmd_byte = JbdControlMsg.write_register_all
+        cmd_byte = self._wr_cmd[JbdPanel.all]
         self.logger.warning("Per color register writes not supported in this FW"
                             " version, overriding to use write all panels.")
       else:
@@ -1568,36 +2010,12 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
                                   "this FW version.  Please up date to a newer "
                                   "version.")
 
-    #print(f"address={reg_address}, data={reg_data}")
-    if isinstance(reg_address, str):
-      reg_address_str = reg_address
-      reg_address = []
-      reg_address_str = reg_address_str.replace("0x", "")
-      #print(reg_address_str)
-      for i in range(0, 8, 2):
-        #print(reg_address_str[i:i+2])
-        reg_address.append(int(reg_address_str[i:i+2], 16))
-    #print(reg_address)
-    #print([hex(x) for x in reg_address])
-    if isinstance(reg_data, str):
-      reg_data_str = reg_data
-      reg_data = []
-      reg_data_str = reg_data_str.replace("0x", "")
-      #print(reg_data_str)
-      #for i in range(8,0,-2):
-        #print(reg_data_str[i-2:i])
-      #  reg_data.append(int(reg_data_str[i-2:i], 16))
-      for i in range(0, 8, 2):
-        #print(reg_data_str[i:i+2])
-        reg_data.append(int(reg_data_str[i:i+2], 16))
-    #print(reg_data)
-    #print([hex(x) for x in reg_data])
-    address_and_data = [*reg_address, *reg_data]
-    #print(f"address={[hex(x) for x in reg_address]}, "
-    #      f"data={[hex(x) for x in reg_data]}")
-    ctrl_msg = cmd_byte.value + bytearray(address_and_data)
-    #input()
-    return self.query(self._build_msg(ctrl_msg))
+    # lists are not hashable, the cache needs tuples
+    if not isinstance(reg_address, str):
+      reg_address = tuple(reg_address)
+    if not isinstance(reg_data, str):
+      reg_data = tuple(reg_data)
+    return _build_write_register_msg(cmd_byte, reg_address, reg_data)
 
   def get_register(self, panel: JbdPanel, reg_address: list | str, debug=False):
     """Get (read) register address and data.
@@ -1620,39 +2038,17 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
       None
     """
     #debug = True
-    if isinstance(reg_address, str):
-      reg_address_str = reg_address
-      reg_address_list = []
-      reg_address_str = reg_address_str.replace("0x", "")
-      for i in range(0, 8, 2):
-        reg_address_list.append(int(reg_address_str[i:i+2], 16))
-    else:
-      reg_address_list = reg_address
-    ctrl_msg = (JbdControlMsg.read_register.value + panel.value +
-                bytearray(reg_address_list))
-    resp = self._parse_data_flow(self.query(self._build_msg(ctrl_msg)))
-
-    reads = JbdReadResponse()
+    if not debug and not isinstance(reg_address, str):
+      # raw bytes wanted, skip building the JbdReadResponse
+      return self._read_register_flow(panel, reg_address)[1:]
+    resp, reads = self._read_register(panel, reg_address)
     reads_fields = fields(reads)
-    #print(reads)
-    #print(len(reads_fields))
-    i = 0
-    while i < len(resp):
-      setattr(reads, reads_fields[int(resp[i])].name, resp[i+1:i+5])
-      i += 5
-    #print(reads)
 
     if debug:
       if isinstance(reg_address, str) and isinstance(resp, bytearray):
-        for var in reads_fields:
-          vn = var.name
-          vv = getattr(reads, vn)
-          if vv is not None:
-            vhex = '0x' + ''.join(format(b, '02x') for b in vv)
-          else:
-            vhex = None
-          print(f"{vn} = {vhex}, ", end="")
-        print("")
+        # opt-in dump asked for by the caller, printed whatever the log level
+        print("".join(f"{var.name} = {_hex(getattr(reads, var.name))}, "
+                      for var in reads_fields))
     else:
       if isinstance(reg_address, str) and isinstance(resp, bytearray):
         # resp_str = "0x"
@@ -1679,56 +2075,143 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
         # (we make an arbitrary assumption that most people will be working
         # with a projector and red & blue will connect to control board via
         # the green FPC)
-        if reads.g_b2b_r_0x59 is not None:
-          red_resp_str = reads.g_b2b_r_0x59
-        elif reads.r_b2b_r_0x59 is not None:
-          red_resp_str = reads.r_b2b_r_0x59
-        elif reads.b_b2b_r_0x59 is not None:
-          red_resp_str = reads.b_b2b_r_0x59
-        else:
-          red_resp_str = None
-        if red_resp_str is not None:
-          vv = red_resp_str
-          red_resp_str = '0x' + ''.join(format(b, '02x') for b in vv)
-
-        if reads.g_b2b_g_0x5A is not None:
-          green_resp_str = reads.g_b2b_g_0x5A
-        elif reads.r_b2b_g_0x5A is not None:
-          green_resp_str = reads.r_b2b_g_0x5A
-        elif reads.b_b2b_g_0x5A is not None:
-          green_resp_str = reads.b_b2b_g_0x5A
-        else:
-          green_resp_str = None
-        if green_resp_str is not None:
-          vv = green_resp_str
-          green_resp_str = '0x' + ''.join(format(b, '02x') for b in vv)
-
-        if reads.g_b2b_b_0x5B is not None:
-          blue_resp_str = reads.g_b2b_b_0x5B
-        elif reads.r_b2b_b_0x5B is not None:
-          blue_resp_str = reads.r_b2b_b_0x5B
-        elif reads.b_b2b_b_0x5B is not None:
-          blue_resp_str = reads.b_b2b_b_0x5B
-        else:
-          blue_resp_str = None
-        if blue_resp_str is not None:
-          vv = blue_resp_str
-          blue_resp_str = '0x' + ''.join(format(b, '02x') for b in vv)
-
+        resp_strs = {color: _hex(_panel_value(reads, color))
+                     for color in _READ_RESPONSE_FIELDS}
         if panel == JbdPanel.all:
-          return (f"red = {red_resp_str}, green = {green_resp_str}, "
-                   f"blue = {blue_resp_str}")
-        elif panel == JbdPanel.red:
-          return red_resp_str
-        elif panel == JbdPanel.green:
-          return green_resp_str
-        elif panel == JbdPanel.blue:
-          return blue_resp_str
-        else:
-          return None
+          return (f"red = {resp_strs[JbdPanel.red]}, "
+                  f"green = {resp_strs[JbdPanel.green]}, "
+                  f"blue = {resp_strs[JbdPanel.blue]}")
+        return resp_strs.get(panel)
       else:
         return resp[1:]
 
+  def get_register_raw(self, panel: JbdPanel,
+                       reg_address: Union[int, list, str]):
+    """Get (read) a register of one panel as raw bytes.
+
+    Same read as get_register, without building a "0x..." string, so the
+    result can go straight into int.from_bytes.
+
+    Args:
+      panel:
+        JbdPanel, red, green or blue
+      reg_address:
+        int, list of 4 bytes, or str of 4 bytes as "0xXXXXXXXX"
+
+    Returns:
+      bytes, the 4 data bytes, or None if the panel did not answer
+
+    Raises:
+      ValueError: if panel is not red, green or blue
+    """
+    if panel not in _READ_RESPONSE_FIELDS:
+      raise ValueError(f"The {panel} panel type is not supported."
+                       f"Expect one of: {list(_READ_RESPONSE_FIELDS)}")
+    if isinstance(reg_address, int):
+      reg_address = reg_address.to_bytes(4, "big")
+    return _panel_value(self.get_register_parsed(panel, reg_address), panel)
+
+  def get_register_parsed(self, panel: JbdPanel,
+                          reg_address: Union[list, str]):
+    """Get (read) a register and return the parsed response.
+
+    Same read as get_register, without formatting any strings.
+
+    Args:
+      panel:
+        JbdPanel, any color or all
+      reg_address:
+        list of 4 bytes, or str of 4 bytes as "0xXXXXXXXX"
+
+    Returns:
+      JbdReadResponse, the fields of the panels that did not answer are None
+
+    Raises:
+      None
+    """
+    return self._read_register(panel, reg_address)[1]
+
+  def _get_register_masked(self, panel: JbdPanel, reg_address, mask):
+    """Reads a register, returns hex(value & mask) per panel.
+
+    A list of 3 for JbdPanel.all (red, green, blue), else a single value.
+    None for a panel that did not answer.
+    """
+    reads = self.get_register_parsed(panel, reg_address)
+    colors = _READ_RESPONSE_FIELDS if panel == JbdPanel.all else (panel,)
+    values = [None if data is None else hex(int.from_bytes(data, "big") & mask)
+              for data in (_panel_value(reads, color) for color in colors)]
+    return values if panel == JbdPanel.all else values[0]
+
+  def _read_register_flow(self, panel: JbdPanel, reg_address: list | str):
+    """Reads a register, returns the data_flow as is (no JbdReadResponse)."""
+    if isinstance(reg_address, str):
+      reg_address_list = bytes.fromhex(reg_address.removeprefix("0x"))
+    else:
+      reg_address_list = reg_address
+    ctrl_msg = b"".join((_CMD_READ_REGISTER, _PANEL_VAL[panel],
+                         bytes(reg_address_list)))
+    return self._parse_data_flow(self.query(self._build_msg(ctrl_msg)))
+
+  def _read_registers_flow(self, panel: JbdPanel, reg_addresses):
+    """Reads many registers, returns the data_flow of each.
+
+    The FW has no bulk read command, so the read commands are pipelined:
+    REGISTER_READ_BATCH of them go out in one write, then the responses
+    (12 byte header + data_flow + checksum each) are split off the input.
+    If a response does not look like one, the rest of that batch is read
+    one register at a time.
+
+    Args:
+      panel:
+        JbdPanel, any color
+      reg_addresses:
+        list of 4 byte addresses (bytes or list of int)
+
+    Returns:
+      list, the data_flow of each read, as from _read_register_flow
+    """
+    if self._batch:  # keep the order of anything queued by batch()
+      self._flush_batch()
+    flows = []
+    for i in range(0, len(reg_addresses), REGISTER_READ_BATCH):
+      batch = reg_addresses[i:i + REGISTER_READ_BATCH]
+      msgs = b"".join(self._build_msg(b"".join((
+        _CMD_READ_REGISTER, _PANEL_VAL[panel], bytes(reg_address))))
+                      for reg_address in batch)
+      if self.in_waiting:
+        self.read(self.in_waiting)
+      self.write(msgs)
+      start = len(flows)
+      for _ in batch:
+        header = self.read(12)
+        if (len(header) < 12 or header[0:1] != _CMD_READ_REGISTER or
+            header[9:12] != CMD_SUFFIX):
+          break
+        flow = self.read(self._bytes_to_int(header[1:5]) + 1)
+        flows.append(self._parse_data_flow(header + flow))
+      n = len(flows) - start
+      if n < len(batch):
+        self.logger.warning("unexpected read response, reading %d registers "
+                            "one at a time - batch", len(batch) - n)
+        while self.read(max(1, self.in_waiting)):
+          pass  # drop the rest of the pipelined responses
+        flows.extend(self._read_register_flow(panel, reg_address)
+                     for reg_address in batch[n:])
+    return flows
+
+  def _read_register(self, panel: JbdPanel, reg_address: list | str):
+    """Reads a register, returns the data_flow and the parsed JbdReadResponse.
+    """
+    resp = self._read_register_flow(panel, reg_address)
+
+    # records are a tag byte (index into the fields) and 4 data bytes
+    whole = len(resp) - len(resp) % 5
+    reads = JbdReadResponse(**{
+      _READ_RESPONSE_NAMES[tag]: value
+      for tag, value in struct.iter_unpack("<B4s", resp[:whole])})
+    return resp, reads
+
   def disable_lreg_and_gamma(self, panel: JbdPanel = JbdPanel.all):
     """Disable Global brighness adjustment and Disable Gamma function.
 
@@ -1763,14 +2246,12 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
     Raises:
       None
     """
-    #Enable Global brightness adjustment and Enable Gamma function
-    register_address = [0x03, 0x02, 0xAE, 0x00]
-    register_data = [0x00, 0x00, 0x03, 0x80]
-    self.set_register(register_address, register_data, panel)
-    #disable internal dimming function
-    register_address = [0x03, 0x02, 0xAE, 0x04]
-    register_data = [0x01, 0x04, 0x10, 0x1E]
-    self.set_register(register_address, register_data, panel)
+    self.set_register_batch([
+      #Enable Global brightness adjustment and Enable Gamma function
+      ([0x03, 0x02, 0xAE, 0x00], [0x00, 0x00, 0x03, 0x80], panel),
+      #disable internal dimming function
+      ([0x03, 0x02, 0xAE, 0x04], [0x01, 0x04, 0x10, 0x1E], panel),
+    ])
 
   def gammma_on_off(self, enable: bool, setting:GammaSetting,
                     panel: JbdPanel = JbdPanel.all):
@@ -1811,10 +2292,9 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
                                 "version.")
     #print(enable)
     #print(setting)
-    ctrl_msg = (JbdControlMsg.gamma_on_off.value + bytearray([int(enable)]) +
-                setting)
+    ctrl_msg = _CMD_GAMMA_ON_OFF + bytes((int(enable),)) + setting
     #print(ctrl_msg)
-    return self.query(self._build_msg(ctrl_msg))
+    return self.query(_build_msg_cached(ctrl_msg))
 
   def clear_screen(self, panel: JbdPanel = JbdPanel.all):
     """Clear screen for all connected panels.
@@ -1834,8 +2314,7 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
     if panel != JbdPanel.all:
       raise NotImplementedError("JBD has not implemented clear screen function"
                                 "for individual panels.")
-    ctrl_msg = JbdControlMsg.clear_display.value
-    return self.query(self._build_msg(ctrl_msg))
+    return self.query(_CLEAR_DISPLAY_FRAME)
 
   def set_gamma_tables(self, setting:str = None,
                        panel: JbdPanel = JbdPanel.all):
@@ -1882,13 +2361,16 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
       None
     """
     if gamma_csv_path is None:
-      current_file_directory = os.path.dirname(os.path.abspath(__file__))
       gamma_file = "gamma1.0_2.csv"
-      gamma_csv_path = os.path.join(current_file_directory, gamma_file)
-    gamma_tables = np.genfromtxt(gamma_csv_path, delimiter=",",
-                                 dtype=str, skip_header=1, comments="#")
-    for row in gamma_tables:
-      self.set_register(row[0], row[1], panel)
+      gamma_csv_path = os.path.join(_MODULE_DIR, gamma_file)
+    gamma_tables = _load_register_pairs(gamma_csv_path,
+                                        os.path.getmtime(gamma_csv_path))
+    # pipelined batches instead of a round trip per register, the FW has no
+    # bulk write command.  Batches keep a lost ACK from stalling 1000+ writes.
+    writes = [(reg_address, reg_data, panel)
+              for reg_address, reg_data in gamma_tables]
+    for i in range(0, len(writes), REGISTER_WRITE_BATCH):
+      self.set_register_batch(writes[i:i + REGISTER_WRITE_BATCH])
 
   def read_gamma_tables(self, panel: JbdPanel, gamma_csv_path=None):
     """Read the gamma tables to a file
@@ -1933,11 +2415,10 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
     #   gamma_read_path = gamma_csv_path
     # np.savetxt(gamma_read_path, np.column_stack((gamma_addr, gamma_val)),
     #            delimiter=",", fmt="%s", header="Address, Value")
-    current_file_directory = os.path.dirname(os.path.abspath(__file__))
     gamma_addr_file = "gamma_tables_addresses.csv"
-    gamma_addr_path = os.path.join(current_file_directory, gamma_addr_file)
+    gamma_addr_path = os.path.join(_MODULE_DIR, gamma_addr_file)
     if gamma_csv_path is None:
-      gamma_read_path = os.path.join(current_file_directory, "gamma_read.csv")
+      gamma_read_path = os.path.join(_MODULE_DIR, "gamma_read.csv")
     else:
       gamma_read_path = gamma_csv_path
     self.read_registers(panel, gamma_addr_path, gamma_read_path)
@@ -1966,19 +2447,11 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
     if panel == JbdPanel.all:
       raise NotImplementedError("Read Registers has not been implemented, "
                                 "for the 'all' panels option")
-    addr = np.genfromtxt(address_path, delimiter=",", dtype=str,
-                               skip_header=1)
-    read_val = []
-    for i, row in enumerate(addr):
-      row_0x_strip = row.replace("0x", "")
-      addr_bytearray = bytearray.fromhex(row_0x_strip)
-      data_bytearray = self.get_register(panel, addr_bytearray)
-      # print(data_bytearray)
-      data_str = bytes(data_bytearray).hex()
-      # print(data_str)
-      # read_val[i] = '0x' + data_str
-      read_val.append("0x" + data_str)
-    print(read_val)
+    addr = [row[0] for row in _read_csv_rows(address_path)]
+    reg_addresses = [bytes.fromhex(a.removeprefix("0x")) for a in addr]
+    read_val = [_hex(flow[1:])
+                for flow in self._read_registers_flow(panel, reg_addresses)]
+    self.logger.debug("Read registers: %s", read_val)
     np.savetxt(output_path, np.column_stack((addr, read_val)),
                delimiter=",", fmt="%s", header="Address, Value")
 
@@ -2011,15 +2484,11 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
     start_row = int(start_row)
     end_col = int(end_col)
     end_row = int(end_row)
-    # put values into 3-bit segments
-    v1 = (start_row >> 4) & 0x00ff
-    v2 = ((start_row & 0x000f) << 4) | ((start_col >> 8) & 0x000f)
-    v3 = start_col & 0x00ff
-    v4 = (end_row >> 4) & 0x00ff
-    v5 = ((end_row & 0x000f) << 4) | ((end_col >> 8) & 0x000f)
-    v6 = end_col & 0x00ff
-    ctrl_msg = JbdControlMsg.draw_rectangle.value + bytearray(
-      [v1, v2, v3, v4, v5, v6, gray])
+    # row and col are 12 bits each, packed as row:col in 3 bytes per corner
+    corners = ((start_row & 0xFFF) << 36 | (start_col & 0xFFF) << 24 |
+               (end_row & 0xFFF) << 12 | (end_col & 0xFFF))
+    ctrl_msg = (_CMD_DRAW_RECTANGLE + corners.to_bytes(6, "big") +
+                bytes((gray,)))
     return self.query(self._build_msg(ctrl_msg)).decode(
       errors="backslashreplace")
 
@@ -2045,14 +2514,15 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
 
     if not os.path.exists(image_path):
       raise FileNotFoundError(image_path)
-    img = cv2.imread(image_path)
-    img = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    # grayscale files load as one plane, only color files need converting
+    img = cv2.imread(image_path, cv2.IMREAD_ANYCOLOR)
+    if img.ndim == 3:
+      img = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
     if grayscale_clip is not None:
       if grayscale_clip > 255 : grayscale_clip = 255
-      img = np.clip(img, 0, grayscale_clip)
-    image_msg = bytearray(img.flatten())
-    rows = int(0).to_bytes(2, "big")  # NOTE These are not used per the API
-    cols = int(0).to_bytes(2, "big")
+      np.minimum(img, np.uint8(grayscale_clip), out=img)
+    # one copy straight to bytes (flatten + bytearray copied twice)
+    image_msg = np.ascontiguousarray(img).tobytes()
     self.logger.debug("image shape: %s", img.shape)
     if self._resolution:
       expected_image_mgs_len = self._resolution[0] * self._resolution[1]
@@ -2062,11 +2532,8 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
     else:
       self.logger.warning("Writing image with unknown resolution settings.")
     flow_len = len(image_msg).to_bytes(4, "big")
-    msg = (JbdControlMsg.display_mono_image.value + rows + cols + flow_len +
-           CMD_SUFFIX)
-    chk = self._calc_xor_checksum(image_msg)
-    msg = msg + image_msg + chk
-    self.query(msg, response_delay=2)
+    msg = _CMD_DISPLAY_MONO_IMAGE + _IMAGE_ROWS_COLS + flow_len + CMD_SUFFIX
+    self.query(self._build_flow_msg(msg, image_msg), response_delay=2)
 
   def set_panel_refresh_rate(self, refresh_rate: RefreshRate,
                              panel: JbdPanel = JbdPanel.all):
@@ -2152,11 +2619,10 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
     # not RGB
     
     if grayscale_clip is not None:
-      img = np.clip(img, 0, grayscale_clip)
-    image_msg = bytearray(img.flatten())
+      np.minimum(img, np.uint8(min(grayscale_clip, 255)), out=img)
+    # one copy straight to bytes (flatten + bytearray copied twice)
+    image_msg = np.ascontiguousarray(img).tobytes()
     self.logger.debug(f'image_msg number of bytes = {len(image_msg)}')
-    rows = int(0).to_bytes(2, "big")  # NOTE These are not used per the API
-    cols = int(0).to_bytes(2, "big")
     self.logger.debug("image shape: %s", img.shape)
     if self._resolution:
       expected_image_mgs_len = self._resolution[0] * self._resolution[1] * 3
@@ -2167,10 +2633,8 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
       self.logger.warning("Writing image with unknown resolution settings.")
     flow_len = len(image_msg).to_bytes(4, "big")
     self.logger.debug(f'flow len = {flow_len}')
-    msg = (JbdControlMsg.display_color_image.value + rows + cols + flow_len +
-           CMD_SUFFIX)
-    chk = self._calc_xor_checksum(image_msg)
-    msg = msg + image_msg + chk
+    msg = _CMD_DISPLAY_COLOR_IMAGE + _IMAGE_ROWS_COLS + flow_len + CMD_SUFFIX
+    msg = self._build_flow_msg(msg, image_msg)
     self.logger.debug(f'msg number of bytes = {len(msg)}')
     self.query(msg, response_delay=2)
 
@@ -2200,15 +2664,13 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
 
     if grayscale_clip is not None:
       if grayscale_clip > 255: grayscale_clip = 255
-      img = np.clip(img, 0, grayscale_clip)
+      np.minimum(img, np.uint8(grayscale_clip), out=img)
     # image order required appears to be RGB (based on inspection)
     img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
     rle_msg = self._color_image_to_rle_bytes(img)
     flow_len = len(rle_msg).to_bytes(4, "big")
-    msg = (JbdControlMsg.write_color_image_rle.value + flow_len +
-           b'\x00\x00\x00' + CMD_SUFFIX)
-    chk = self._calc_xor_checksum(rle_msg)
-    msg = msg + rle_msg + chk
+    msg = _CMD_WRITE_COLOR_IMAGE_RLE + flow_len + _RLE_HEADER_TAIL
+    msg = self._build_flow_msg(msg, rle_msg)
     self.logger.debug("msg number of bytes = %s", len(msg))
     self.query(msg, response_delay=2)
 
@@ -2225,44 +2687,30 @@ class Jbd4020CtrlBrd(Jbd4020SerialUart):
     Raises:
       None
     """
-    encoded_msg = bytearray()
-    ch_data = [bytearray()] * 3
-    ch_len = [bytearray()] * 3
-    for i in range(3):
-      ch_data[i] = self._rle_encode(bytearray(image[:,:,i].flatten()))
-      ch_len[i] = len(ch_data[i]).to_bytes(4, "big")
-    for i in range(3):
-      encoded_msg.extend(ch_len[i])
-    for i in range(3):
-      encoded_msg.extend(ch_data[i])
-    return encoded_msg
+    # one transpose to channel planes, each plane is then contiguous
+    chw = np.ascontiguousarray(image.transpose(2, 0, 1))
+    futures = [_RLE_POOL.submit(self._rle_encode, chw[i].ravel())
+               for i in range(3)]
+    ch_data = [future.result() for future in futures]
+    # the three channel lengths, then the channels, joined in one allocation
+    return bytearray().join((struct.pack(">III", *map(len, ch_data)),
+                             *ch_data))
 
   def _rle_encode(self, in_msg):
     """ Encodes an input byte array with RLE (Run Length Encoding).
 
     Args:
       in_msg:
-        bytearray, data to be encoded
+        bytearray, bytes or np.uint8 array, data to be encoded
 
     Returns:
-       bytearray, RLE encoded
+       bytes, RLE encoded, (value, count) byte pairs, count 1..255
 
     Raises:
       None
     """
-    encoded_msg = bytearray()
-    i = 0
-    j = 0
-    while i < len(in_msg):
-      length = min(256, len(in_msg) - i + 1)
-      for j in range(1, length):
-        if i + j >= len(in_msg):
-          break
-        elif in_msg[i + j] != in_msg[i]:
-          break
-        else:
-          pass
-      encoded_msg.append(in_msg[i])
-      encoded_msg.append(j)
-      i = i + j
-    return encoded_msg
+    if isinstance(in_msg, np.ndarray):
+      data = in_msg.ravel()
+    else:
+      data = np.frombuffer(in_msg, dtype=np.uint8)
+    return _rle_encode_array(data).tobytes()
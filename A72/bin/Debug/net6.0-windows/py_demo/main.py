@@ -3,6 +3,9 @@ import time
 
 ml= Colorimeter()
 
+# settle time after each cycle test step, MLSDK has no ready/status query
+STEP_DELAY = 2
+
 # Colorimeter Func
 # ml.IQ_SetExposure(1000)
 # ml.CLRMTF_CameraFocus()
@@ -31,53 +34,53 @@ ml= Colorimeter()
 
 # add cycle test
 ml.SetExposureTime(1000)
-time.sleep(2)
+time.sleep(STEP_DELAY)
 
 ml.SetCylinderMirror(-1, 45)
-time.sleep(2)
+time.sleep(STEP_DELAY)
 
 ml.SetCameraBinning(1)
-time.sleep(2)
+time.sleep(STEP_DELAY)
 
 ml.SwitchNDFilter("ND3")
-time.sleep(2)
+time.sleep(STEP_DELAY)
 
 ml.SwitchXYZFilter('Y')
-time.sleep(2)
+time.sleep(STEP_DELAY)
 
 ml.GoToTestPosition()
-time.sleep(2)
+time.sleep(STEP_DELAY)
 
 ml.SetSpectroradiometerConfigByIndex(1)
-time.sleep(2)
+time.sleep(STEP_DELAY)
 
 for index in range(0, 9):
     ml.GetChromaXYZImage(0)
-    time.sleep(2)
+    time.sleep(STEP_DELAY)
 
     ml.SetElectricMirrorState(1)
-    time.sleep(2)
+    time.sleep(STEP_DELAY)
 
     ml.SpectroradiometerStartMeasurement()
-    time.sleep(2)
+    time.sleep(STEP_DELAY)
 
     ml.SetElectricMirrorState(0)
-    time.sleep(2)
+    time.sleep(STEP_DELAY)
 
     ml.CLRMTF_GetXYZImg()
-    time.sleep(2)
+    time.sleep(STEP_DELAY)
 
     ml.GetSpectroradiometerXYZResult()
-    time.sleep(2)
+    time.sleep(STEP_DELAY)
 
     ml.SetResultCompareROI(1000, 2000, 500, 300)
-    time.sleep(2)
+    time.sleep(STEP_DELAY)
 
     ml.CompareChromaticity()
-    time.sleep(2)
+    time.sleep(STEP_DELAY)
 
     ml.GoToEyeBoxLocationByIndex(1, index)
-    time.sleep(2)
+    time.sleep(STEP_DELAY)
 
 ml.GoToLoadPosition()
 
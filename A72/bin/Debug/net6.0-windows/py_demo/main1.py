@@ -27,9 +27,10 @@ for request in range(1):
     cols = int(socket.recv_string())
     channel = int(socket.recv_string())
     depth = int(socket.recv_string())
-    image_bytes = socket.recv()
-    imageY_bytes = socket.recv()
-    imageZ_bytes = socket.recv()
+    # zero-copy frames, numpy reads straight from the zmq message buffers
+    image_bytes = socket.recv(copy=False)
+    imageY_bytes = socket.recv(copy=False)
+    imageZ_bytes = socket.recv(copy=False)
 
     if(depth == cv2.CV_8U):
         dtype = numpy.uint8
@@ -38,12 +39,9 @@ for request in range(1):
 
 
     # Converting bytes data to ndarray
-    image = numpy.frombuffer(image_bytes, dtype)
-    image = image.reshape(rows, cols, channel)
-    imageY = numpy.frombuffer(imageY_bytes, dtype)
-    imageY = imageY.reshape(rows, cols, channel)
-    imageZ = numpy.frombuffer(imageZ_bytes, dtype)
-    imageZ = imageZ.reshape(rows, cols, channel)
+    image = numpy.frombuffer(image_bytes.buffer, dtype).reshape(rows, cols, channel)
+    imageY = numpy.frombuffer(imageY_bytes.buffer, dtype).reshape(rows, cols, channel)
+    imageZ = numpy.frombuffer(imageZ_bytes.buffer, dtype).reshape(rows, cols, channel)
 
     
 
@@ -52,4 +50,4 @@ for request in range(1):
     cv2.imwrite("C:/Users/tao.sun/Desktop/VVV-Z.tif", imageZ)
     #cv2.imshow("ReadImg", image)
 
-    print(f"Received reply {request} [ {image_bytes } ]")
\ No newline at end of file
+    print(f"Received reply {request} [ {len(image_bytes.buffer)} bytes ]")
\ No newline at end of file